@@ -0,0 +1,404 @@
+import abc
+import queue
+
+from collections import Counter
+
+from .geometry import Dims
+
+
+class WinBackend:
+    # everything bbwm needs from the OS
+    # windows are identified by their (integer) handles
+    __metaclass__ = abc.ABCMeta
+
+    # -- displays -- #
+
+    @abc.abstractmethod
+    def monitors(self):
+        # [(handle, Dims), ...]
+        return
+
+    @abc.abstractmethod
+    def monitor_from_window(self, hwnd):
+        # handle of the nearest monitor (or None)
+        return
+
+    # -- windows -- #
+
+    @abc.abstractmethod
+    def enum_windows(self):
+        return
+
+    @abc.abstractmethod
+    def get_title(self, hwnd):
+        return
+
+    @abc.abstractmethod
+    def get_class_name(self, hwnd):
+        return
+
+    @abc.abstractmethod
+    def get_process_name(self, hwnd):
+        # exe name, like 'notepad.exe'
+        return
+
+    @abc.abstractmethod
+    def get_style(self, hwnd):
+        # (style, extended style) bits
+        return
+
+    @abc.abstractmethod
+    def get_rect(self, hwnd):
+        # Dims or None
+        return
+
+    @abc.abstractmethod
+    def move(self, hwnd, dims):
+        return
+
+    @abc.abstractmethod
+    def begin_defer(self, n):
+        # deferred moves, see MoveBatch
+        return
+
+    @abc.abstractmethod
+    def defer(self, handle, hwnd, dims):
+        return
+
+    @abc.abstractmethod
+    def defer_visibility(self, handle, hwnd, visible):
+        # show/hide as part of the deferred moves
+        return
+
+    @abc.abstractmethod
+    def end_defer(self, handle):
+        return
+
+    @abc.abstractmethod
+    def is_decorated(self, hwnd):
+        return
+
+    @abc.abstractmethod
+    def set_decorated(self, hwnd, decorated):
+        return
+
+    @abc.abstractmethod
+    def is_visible(self, hwnd):
+        return
+
+    @abc.abstractmethod
+    def show_normal(self, hwnd):
+        # show it, returns whether it was visible before
+        return
+
+    @abc.abstractmethod
+    def hide(self, hwnd):
+        return
+
+    @abc.abstractmethod
+    def bring_to_top(self, hwnd):
+        return
+
+    @abc.abstractmethod
+    def set_topmost(self, hwnd):
+        return
+
+    # -- focus & mouse -- #
+
+    @abc.abstractmethod
+    def foreground_window(self):
+        return
+
+    @abc.abstractmethod
+    def focus(self, hwnd):
+        # returns True if it worked
+        return
+
+    @abc.abstractmethod
+    def window_from_point(self, point):
+        return
+
+    @abc.abstractmethod
+    def cursor_pos(self):
+        return
+
+    @abc.abstractmethod
+    def set_cursor_pos(self, point):
+        return
+
+    # -- events -- #
+
+    @abc.abstractmethod
+    def start_listening(self, hotkeys):
+        # hotkeys are [(id, key combo), ...]
+        return
+
+    @abc.abstractmethod
+    def stop_listening(self):
+        # can be called from any thread, whatever's waiting in next_msg gets None
+        return
+
+    @abc.abstractmethod
+    def next_msg(self, block=True):
+        # (action hint, hwnd) where the hint is either one of
+        # 'new_win', 'close_win', 'focus_win', 'title_change', 'win_moved',
+        # 'display_change' or a hotkey id
+        # None once there are no more (or nothing waiting if not blocking)
+        return
+
+
+class SimWindow:
+    def __init__(self, title, rect, decorated=True, visible=True,
+                 cls='SimWindow', process='sim.exe', style=(0, 0)):
+        self.title = title
+        self.cls = cls
+        self.process = process
+        self.style = style
+        self.rect = rect
+        self.decorated = decorated
+        self.visible = visible
+        self.minimized = False
+        self.topmost = False
+
+
+class SimBackend(WinBackend):
+    # deterministic in-memory desktop for running bbwm off windows
+    # every backend call gets counted in self.calls
+    def __init__(self, monitor_dims=None):
+        if monitor_dims is None:
+            monitor_dims = [Dims(0, 0, 1920, 1080)]
+        self._monitors = [(i + 1, d) for i, d in enumerate(monitor_dims)]
+
+        self.windows = {}
+        self._next_hwnd = 0x100
+        self._foreground = 0
+        self._cursor = (0, 0)
+
+        self.hotkeys = {}
+        self._msgs = queue.Queue()
+        self.calls = Counter()
+
+    # -- driving the simulation -- #
+
+    def create_window(self, title='', rect=None, focus=True, **kwargs):
+        if rect is None:
+            rect = Dims(10, 10, 640, 480)
+        hwnd = self._next_hwnd
+        self._next_hwnd += 1
+        self.windows[hwnd] = SimWindow(title, rect, **kwargs)
+        self._msgs.put(('new_win', hwnd))
+        if focus:
+            self.focus_window(hwnd)
+        return hwnd
+
+    def close_window(self, hwnd):
+        if self.windows.pop(hwnd, None) is not None:
+            self._msgs.put(('close_win', hwnd))
+        if self._foreground == hwnd:
+            self._foreground = 0
+
+    def focus_window(self, hwnd):
+        self._foreground = hwnd
+        self._msgs.put(('focus_win', hwnd))
+
+    def set_title(self, hwnd, title):
+        self.windows[hwnd].title = title
+        self._msgs.put(('title_change', hwnd))
+
+    def move_window(self, hwnd, rect):
+        # like the user dragging it somewhere
+        self.windows[hwnd].rect = rect
+        self._msgs.put(('win_moved', hwnd))
+
+    def press(self, key_combo):
+        for hk_id, combo in self.hotkeys.items():
+            if combo == key_combo:
+                self._msgs.put((hk_id, 0))
+                return hk_id
+
+    def change_monitors(self, monitor_dims):
+        self._monitors = [(i + 1, d) for i, d in enumerate(monitor_dims)]
+        self._msgs.put(('display_change', 0))
+
+    def quit(self):
+        self._msgs.put(None)
+
+    # -- displays -- #
+
+    def monitors(self):
+        self.calls['monitors'] += 1
+        return list(self._monitors)
+
+    def monitor_from_window(self, hwnd):
+        self.calls['monitor_from_window'] += 1
+        win = self.windows.get(hwnd)
+        if win is None:
+            return self._monitors[0][0]
+        # whichever display has its midpoint (or closest to it)
+        x, y = win.rect.midpoint()
+        return min(self._monitors, key=lambda m: m[1].distance_to(x, y))[0]
+
+    # -- windows -- #
+
+    def enum_windows(self):
+        self.calls['enum_windows'] += 1
+        return list(self.windows)
+
+    def get_title(self, hwnd):
+        self.calls['get_title'] += 1
+        win = self.windows.get(hwnd)
+        return win.title if win is not None else ''
+
+    def get_class_name(self, hwnd):
+        self.calls['get_class_name'] += 1
+        win = self.windows.get(hwnd)
+        return win.cls if win is not None else ''
+
+    def get_process_name(self, hwnd):
+        self.calls['get_process_name'] += 1
+        win = self.windows.get(hwnd)
+        return win.process if win is not None else ''
+
+    def get_style(self, hwnd):
+        self.calls['get_style'] += 1
+        win = self.windows.get(hwnd)
+        return win.style if win is not None else (0, 0)
+
+    def get_rect(self, hwnd):
+        self.calls['get_rect'] += 1
+        win = self.windows.get(hwnd)
+        return win.rect if win is not None else None
+
+    def move(self, hwnd, dims):
+        self.calls['move'] += 1
+        win = self.windows.get(hwnd)
+        if win is not None:
+            win.rect = Dims(*dims)
+            win.visible = True
+            win.minimized = False
+
+    def begin_defer(self, n):
+        self.calls['begin_defer'] += 1
+        return []
+
+    def defer(self, handle, hwnd, dims):
+        self.calls['defer'] += 1
+        if hwnd not in self.windows:
+            raise ValueError('invalid window: {}'.format(hwnd))
+        handle.append((hwnd, dims))
+        return handle
+
+    def defer_visibility(self, handle, hwnd, visible):
+        self.calls['defer_visibility'] += 1
+        if hwnd not in self.windows:
+            raise ValueError('invalid window: {}'.format(hwnd))
+        handle.append((hwnd, visible))
+        return handle
+
+    def end_defer(self, handle):
+        self.calls['end_defer'] += 1
+        for hwnd, change in handle:
+            win = self.windows[hwnd]
+            if change is False:
+                win.visible = False
+                self._msgs.put(('close_win', hwnd))
+                continue
+            if change is not True:
+                win.rect = Dims(*change)
+            win.visible = True
+            win.minimized = False
+
+    def is_decorated(self, hwnd):
+        self.calls['is_decorated'] += 1
+        win = self.windows.get(hwnd)
+        return win.decorated if win is not None else None
+
+    def set_decorated(self, hwnd, decorated):
+        self.calls['set_decorated'] += 1
+        win = self.windows.get(hwnd)
+        if win is not None:
+            win.decorated = decorated
+
+    def is_visible(self, hwnd):
+        self.calls['is_visible'] += 1
+        win = self.windows.get(hwnd)
+        return win is not None and win.visible
+
+    def show_normal(self, hwnd):
+        self.calls['show_normal'] += 1
+        win = self.windows.get(hwnd)
+        if win is None:
+            return False
+        was_visible = win.visible
+        win.visible = True
+        win.minimized = False
+        return was_visible
+
+    def hide(self, hwnd):
+        self.calls['hide'] += 1
+        win = self.windows.get(hwnd)
+        if win is not None:
+            win.visible = False
+            # windows reports hiding the same way as closing
+            self._msgs.put(('close_win', hwnd))
+
+    def bring_to_top(self, hwnd):
+        self.calls['bring_to_top'] += 1
+
+    def set_topmost(self, hwnd):
+        self.calls['set_topmost'] += 1
+        win = self.windows.get(hwnd)
+        if win is not None:
+            win.topmost = True
+
+    # -- focus & mouse -- #
+
+    def foreground_window(self):
+        self.calls['foreground_window'] += 1
+        return self._foreground
+
+    def focus(self, hwnd):
+        self.calls['focus'] += 1
+        win = self.windows.get(hwnd)
+        if win is None:
+            return
+        win.visible = True
+        win.minimized = False
+        if self._foreground != hwnd:
+            self.focus_window(hwnd)
+        return True
+
+    def window_from_point(self, point):
+        self.calls['window_from_point'] += 1
+        x, y = point
+        # no z-order, the newest window wins
+        for hwnd in reversed(list(self.windows)):
+            win = self.windows[hwnd]
+            r = win.rect
+            if win.visible and r.x <= x < r.r_x and r.y <= y < r.b_y:
+                return hwnd
+        return 0
+
+    def cursor_pos(self):
+        self.calls['cursor_pos'] += 1
+        return self._cursor
+
+    def set_cursor_pos(self, point):
+        self.calls['set_cursor_pos'] += 1
+        self._cursor = tuple(point)
+
+    # -- events -- #
+
+    def start_listening(self, hotkeys):
+        self.hotkeys = dict(hotkeys)
+
+    def stop_listening(self):
+        self.hotkeys = {}
+        # wake up a blocking next_msg
+        self._msgs.put(None)
+
+    def next_msg(self, block=True):
+        try:
+            return self._msgs.get(block)
+        except queue.Empty:
+            return
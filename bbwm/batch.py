@@ -0,0 +1,80 @@
+from collections import Counter
+
+
+class MoveBatch:
+    # collects window moves and hands them to the backend in one go
+    # (begin -> defer each window -> end) so they get applied & repainted together
+    # windows already sitting where they should be are skipped
+    # showing & hiding windows can go in the same batch
+    def __init__(self, backend, stats=None, hidden=None):
+        self.backend = backend
+        self.moves = []
+        self.shows = []
+        self.hides = []
+        # moves issued vs skipped
+        self.stats = Counter() if stats is None else stats
+        # hwnds of windows we hid get counted here
+        self.hidden = hidden
+
+    def __len__(self):
+        return len(self.moves) + len(self.shows) + len(self.hides)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+
+    def add(self, win, dims, force=False):
+        if not force and win.applied_dims == dims:
+            self.stats['skipped'] += 1
+            return
+        self.moves.append((win, dims))
+
+    def show(self, win):
+        if not self.backend.is_visible(win.hwnd):
+            self.shows.append(win)
+
+    def hide(self, win):
+        if self.backend.is_visible(win.hwnd):
+            self.hides.append(win)
+
+    def commit(self):
+        moves, self.moves = self.moves, []
+        hides, self.hides = self.hides, []
+        # moving a window shows it anyway
+        moved = {win.hwnd for win, _ in moves}
+        shows = [win for win in self.shows if win.hwnd not in moved]
+        self.shows = []
+
+        n = len(moves) + len(shows) + len(hides)
+        if not n:
+            return 0
+        try:
+            handle = self.backend.begin_defer(n)
+            for win in hides:
+                handle = self.backend.defer_visibility(handle, win.hwnd, False)
+            for win in shows:
+                handle = self.backend.defer_visibility(handle, win.hwnd, True)
+            for win, dims in moves:
+                handle = self.backend.defer(handle, win.hwnd, dims)
+            self.backend.end_defer(handle)
+        except Exception:
+            # one bad window (closed in the meantime..) sinks the whole batch
+            # so fall back to doing them one by one
+            for win in hides:
+                self.backend.hide(win.hwnd)
+            for win in shows:
+                self.backend.show_normal(win.hwnd)
+                self.backend.bring_to_top(win.hwnd)
+            for win, dims in moves:
+                self.backend.move(win.hwnd, dims)
+        for win, dims in moves:
+            win.applied_dims = dims
+        if self.hidden is not None:
+            self.hidden.update(win.hwnd for win in hides)
+        self.stats['issued'] += len(moves)
+        self.stats['shown'] += len(shows)
+        self.stats['hidden'] += len(hides)
+        return n
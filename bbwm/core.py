@@ -1,5 +1,19 @@
 from .tiling import DefaultTilingScheme
 from .geometry import Dims, Split
+from .rules import DEFAULT_RULES
+
+
+# direction -> (split direction, step)
+NAV_DIRS = {
+    'l': ('h', -1),
+    'r': ('h', 1),
+    'u': ('v', -1),
+    'd': ('v', 1),
+}
+NAV_KEYS = {dn: nd for nd, dn in NAV_DIRS.items()}
+
+# every leaf shares this instead of having its own empty list
+NO_CHILDREN = ()
 
 
 # boxing
@@ -24,21 +38,26 @@ class Workspace:
         self.children = [first_child]
         self.cur_part = first_child
 
+        # ordered leaves, kept up to date by the partitions themselves
+        self.leaf_index = LeafIndex(first_child)
+        for p in iter_pre_order(first_child):
+            p.leaf_index = self.leaf_index
+
         # for pseudo-partitions
         self.parent = None
         self.split = None
         self.assoc_ts = self.tile_scheme
 
-        # moving around
-        self.go_left = lambda: self._move('h', -1)
-        self.go_right = lambda: self._move('h', 1)
-        self.go_up = lambda: self._move('v', -1)
-        self.go_down = lambda: self._move('v', 1)
+        # layout
+        self._dirty = set()
+        self.layout_touched = 0
 
-        self.swap_left = lambda: self._swap('h', -1)
-        self.swap_right = lambda: self._swap('h', 1)
-        self.swap_up = lambda: self._swap('v', -1)
-        self.swap_down = lambda: self._swap('v', 1)
+        # leaf -> {nav dir: target}, only good for one layout version
+        self._nav = {}
+        self._nav_version = -1
+        if first_child is not None:
+            self._mark_dirty(first_child)
+            self.relayout()
 
     def _str_help(self, part, prefix=""):
         if part == self.cur_part:
@@ -50,6 +69,32 @@ class Workspace:
             tor.extend(self._str_help(p, pref))
         return tor
 
+    def set_root(self, root, cur_part=None):
+        # swap in a whole new (parentless) tree, dims get worked out from its splits
+        self.children = [root]
+        self.cur_part = root if cur_part is None else cur_part
+        # keep counting from the old index, or caches keyed on the version
+        # (nav) could take the new tree for one they've already seen
+        old_version = self.leaf_index.version
+        self.leaf_index = LeafIndex(root)
+        self.leaf_index.version = old_version + 1
+        self._nav = {}
+        self._nav_version = -1
+        for p in iter_pre_order(root):
+            p.leaf_index = self.leaf_index
+        root.dims = self.base_dims
+        # nothing below can be trusted so no pruning
+        self._dirty = set()
+        for p in iter_pre_order(root):
+            if p.children:
+                self._mark_dirty(p)
+        self.relayout()
+
+    def set_base_dims(self, base_dims):
+        # its display changed, everything gets laid out again
+        self.base_dims = base_dims
+        self.set_root(self.children[0], self.cur_part)
+
     def __str__(self):
         top_line = '-' * 15
         all_str = self._str_help(self.children[0])
@@ -59,25 +104,50 @@ class Workspace:
         for b in self.children:
             yield b
 
-    def _full_traversal(self, part):
-        tor = [part]
-        for p in part:
-            tor.extend(self._full_traversal(p))
-        return tor
+    # traversal
+
+    def iter_pre_order(self, part=None):
+        if part is None:
+            part = self.children[0]
+        return iter_pre_order(part)
+
+    def iter_post_order(self, part=None):
+        if part is None:
+            part = self.children[0]
+        return iter_post_order(part)
+
+    def iter_leaves(self, part=None):
+        if part is None:
+            part = self.children[0]
+        return iter_leaves(part)
 
     def _traverse(self, part=None, filter_fun=None):
         # either do full traversal
-        # or only return the nodes that match a filter function
+        # or only return the nodes (below part) that match a filter function
         if part is None:
             part = self.children[0]
         if filter_fun is None:
-            return self._full_traversal(part)
-        tor = []
-        for p in part:
-            if filter_fun(p):
-                tor.append(p)
-            tor.extend(self._traverse(p, filter_fun))
-        return tor
+            return list(iter_pre_order(part))
+        return [p for p in iter_pre_order(part) if p is not part and filter_fun(p)]
+
+    # layout
+
+    def _mark_dirty(self, part):
+        # the split (or children) of this partition changed
+        # so everything below it needs new dims
+        self._dirty.add(part)
+        self.leaf_index.touch()
+
+    @property
+    def layout_version(self):
+        return self.leaf_index.version
+
+    def relayout(self):
+        # recompute dims only below dirty partitions
+        # returns how many partitions were touched
+        dirty, self._dirty = self._dirty, set()
+        self.layout_touched = relayout_parts(sorted(dirty, key=part_depth))
+        return self.layout_touched
 
     def _bottom_up_traverse(self, part, stopping_condition=None):
         if stopping_condition is None:
@@ -85,38 +155,34 @@ class Workspace:
                 return not isinstance(p, Partition)
 
         tor = [part]
-        if part.parent is not None and not stopping_condition(part):
-            tor.extend(self._bottom_up_traverse(part.parent, stopping_condition))
+        while part.parent is not None and not stopping_condition(part):
+            part = part.parent
+            tor.append(part)
         return tor
 
     def find_leaf_parts(self, root=None):
-        if root is None:
-            root = self
-        return self._traverse(root, lambda p: p.is_empty)
+        if root is None or root is self:
+            return list(self.leaf_index)
+        return self.leaf_index.subtree(root)
 
     def find_all_splits(self, root=None):
         if root is None:
             root = self
-        return self._traverse(root, lambda p: p.split is not None)
+        return [p for p in iter_pre_order(root) if p.split is not None]
 
     def find_neighbors(self, d, root=None):
         if root is None:
             root = self.cur_part
         i = 1 if d == 'v' else 0
 
-        # find all partitions that were split in the direction we're looking for
-        # from the bottom up
-        cands = self._bottom_up_traverse(root)
-        one_dir = [p for p in cands if p.split is not None and p.split.d == d]
-        # get all their leaves
-        all_p = []
-        for c in one_dir:
-            all_p.extend(self.find_leaf_parts(c))
-
-        # now only do ones that touch..
-        fil_p = [p for p in all_p if p.dims.adjacency_check(root.dims, i)]
+        # leaves whose edge lines up with one of ours (from the edge index)
+        # then only do ones that actually touch..
+        before = self.leaf_index.ending_at(i, root.dims[i])
+        after = self.leaf_index.starting_at(i, root.dims[i] + root.dims[i + 2])
+        fil_p = [p for p in before if p.dims.adjacency_check(root.dims, i)]
         fil_p.append(root)
-        fil_p = list(set(fil_p))
+        fil_p.extend(p for p in after if p.dims.adjacency_check(root.dims, i))
+        fil_p = list(dict.fromkeys(fil_p))
 
         # sort them
         fil_p.sort(key=lambda p: p.dims[i])
@@ -133,11 +199,38 @@ class Workspace:
         next_ps = n_ps[new_i::n]
         return next_ps
 
+    # navigation
+
+    def _nav_targets(self, part):
+        # throw away the whole graph once the layout changes
+        if self._nav_version != self.layout_version:
+            self._nav = {}
+            self._nav_version = self.layout_version
+        if part not in self._nav:
+            self._nav[part] = {}
+        return self._nav[part]
+
+    def nav_graph(self):
+        # fill in every leaf's moves, lazily built otherwise
+        for p in self.leaf_index:
+            targets = self._nav_targets(p)
+            for nd, (d, n) in NAV_DIRS.items():
+                if nd not in targets:
+                    targets[nd] = self._find_move(d, n, p)
+        return self._nav
+
     def find_move(self, d, n):
-        axis = 1 if d == 'v' else 0
         cp = self.cur_part
+        nd = NAV_KEYS[(d, n)]
+        targets = self._nav_targets(cp)
+        if nd not in targets:
+            targets[nd] = self._find_move(d, n, cp)
+        return targets[nd]
 
-        n_ps = self.find_neighbors(d)
+    def _find_move(self, d, n, cp):
+        axis = 1 if d == 'v' else 0
+
+        n_ps = self.find_neighbors(d, cp)
         i = n_ps.index(cp)
         new_i = i + n
 
@@ -146,9 +239,8 @@ class Workspace:
             bot_up = self._bottom_up_traverse(cp, lambda p: p.split is not None and p.split.d == 'n')
             if len(bot_up) and bot_up[-1].split is not None:
                 if bot_up[-1].split.d == 'n':
-                    n_ps = self._traverse(bot_up[-1], lambda p: p.is_empty and p != cp)
-                    if len(n_ps):
-                        return n_ps[0]
+                    n_ps = (p for p in iter_leaves(bot_up[-1]) if p != cp)
+                    return next(n_ps, None)
             return  # no wraparound..
         # now sort by distance
         next_ps = n_ps[new_i::n]
@@ -165,6 +257,32 @@ class Workspace:
         if next_part is not None:
             self.cur_part = next_part
 
+    # moving around
+
+    def go_left(self):
+        self._move('h', -1)
+
+    def go_right(self):
+        self._move('h', 1)
+
+    def go_up(self):
+        self._move('v', -1)
+
+    def go_down(self):
+        self._move('v', 1)
+
+    def swap_left(self):
+        self._swap('h', -1)
+
+    def swap_right(self):
+        self._swap('h', 1)
+
+    def swap_up(self):
+        self._swap('v', -1)
+
+    def swap_down(self):
+        self._swap('v', 1)
+
     def _swap_win(self, p1, p2):
         if p1.window is not None:
             p1.window = p2.window if p2 is not None else None
@@ -225,20 +343,16 @@ class Workspace:
         new_r = 1 - pp.split.r if new_c == 0 else pp.split.r
         pp.split = Split(new_d, new_r, pp.split.t, new_c)
 
-        aff_parts = self._traverse()
-
-        for p in aff_parts:
-            p.resize_from_parent()
+        self._mark_dirty(pp)
+        self.relayout()
 
     def resplit(self, part, new_r):
         if part.split is None:
             return
         part.split = Split(part.split.d, new_r)
 
-        aff_parts = self._traverse()
-
-        for p in aff_parts:
-            p.resize_from_parent()
+        self._mark_dirty(part)
+        self.relayout()
 
     def untile(self, part=None):
         if part is None:
@@ -252,7 +366,9 @@ class Workspace:
 
         # get rid of the partition and reassign indices
 
+        self.leaf_index.remove(cp)
         del cp.parent.children[cp.index]
+        self._mark_dirty(cp.parent)
 
         if len(cp.parent.children) == 1:
             cp.parent.become_child()
@@ -273,20 +389,22 @@ class Workspace:
 
         cp.assoc_ts.untile(cp)
 
-        # now recompute all dims because this doesnt work...
-        aff_parts = self._traverse()
-
-        for p in aff_parts:
-            p.resize_from_parent()
+        # only the old parent's subtree moved
+        self.relayout()
 
         return cp
 
 
 class Partition:
+    # there's a lot of these (and they're kept around by undo history)
+    __slots__ = ('parent', 'children', 'leaf_index', '_dims', 'index',
+                 'split', 'window', 'assoc_ts', '_snap')
+
     def __init__(self, parent, dims, index=0, win=None, ts=None):
         self.parent = parent
-        self.children = []
+        self.children = NO_CHILDREN
 
+        self.leaf_index = None
         self.dims = dims
         self.index = index
         self.split = None
@@ -294,10 +412,26 @@ class Partition:
         if self.window is not None:
             self.window.part = self
         self.assoc_ts = ts  # associated tile-scheme
+        # last undo snapshot of us (see history.py)
+        self._snap = None
+        # workspace's leaf index (if we belong to one)
+        if parent is not None:
+            self.leaf_index = parent.leaf_index
 
     @property
     def is_empty(self):
-        return len(self.children) == 0
+        return not self.children
+
+    @property
+    def dims(self):
+        return self._dims
+
+    @dims.setter
+    def dims(self, new_dims):
+        self._dims = new_dims
+        # keep the edge index in sync
+        if self.leaf_index is not None:
+            self.leaf_index.moved(self)
 
     @property
     def siblings(self):
@@ -326,13 +460,21 @@ class Partition:
     def _traverse(self, part=None):
         if part is None:
             part = self
-        tor = [part]
-        for p in part:
-            tor.extend(self._traverse(p))
-        return tor
+        return list(iter_pre_order(part))
+
+    def iter_pre_order(self):
+        return iter_pre_order(self)
+
+    def iter_post_order(self):
+        return iter_post_order(self)
+
+    def iter_leaves(self):
+        return iter_leaves(self)
 
     def become_child(self, idx=0):
         new_me = self.children[idx]
+        if new_me.is_empty and self.leaf_index is not None:
+            self.leaf_index.replace(new_me, [self])
 
         self.children = new_me.children
         # aah
@@ -372,7 +514,9 @@ class Partition:
         p2 = Partition(self, dim2, 1, new_win)
         # and now we know how we were split
         self.split = Split(d, r)
-        self.children.extend([p1, p2])
+        if self.is_empty and self.leaf_index is not None:
+            self.leaf_index.replace(self, [p1, p2])
+        self.children = [p1, p2]
         if new_win is None:
             return p1, p2
         return p2, p1
@@ -394,12 +538,13 @@ class Partition:
             part.dims = new_dims[i]
 
         new_part = Partition(self.parent, new_dims[-1], n - 1, new_win)
+        if self.leaf_index is not None:
+            self.leaf_index.insert_after(last_leaf(self.parent), new_part)
         self.parent.children.append(new_part)
         self.parent.split = Split(d, n, 'equal')
 
-        aff_parts = self._traverse(self.parent)
-        for aff_p in aff_parts:
-            aff_p.resize_from_parent()
+        # siblings were resized above, now fix up their insides
+        relayout_parts(self.parent.children)
 
         # if new_win is not None:
         return [new_part]
@@ -415,6 +560,190 @@ class Partition:
         return self._split('n', r, new_win)
 
 
+class LeafIndex:
+    # leaves of a workspace in traversal order
+    # every subtree's leaves sit next to each other, so they're a slice
+    # also keeps leaves bucketed by their edges for neighbor lookups
+    def __init__(self, root):
+        self._leaves = list(iter_leaves(root))
+        self._pos = None
+        # bumped whenever the leaves or their dims change
+        self.version = 0
+
+        # per axis: edge coordinate -> leaves with their start/end there
+        self._starts = ({}, {})
+        self._ends = ({}, {})
+        self._edge_dims = {}
+        for p in self._leaves:
+            self._add_edges(p)
+
+    def __iter__(self):
+        return iter(self._leaves)
+
+    def __len__(self):
+        return len(self._leaves)
+
+    def touch(self):
+        self.version += 1
+
+    def __contains__(self, part):
+        return part in self._positions()
+
+    def _positions(self):
+        # rebuilt lazily after the leaves change
+        if self._pos is None:
+            self._pos = {p: i for i, p in enumerate(self._leaves)}
+        return self._pos
+
+    def index(self, part):
+        return self._positions()[part]
+
+    def span(self, part):
+        # start & end of a subtree's leaves
+        pos = self._positions()
+        return pos[first_leaf(part)], pos[last_leaf(part)] + 1
+
+    def subtree(self, part):
+        start, end = self.span(part)
+        return self._leaves[start:end]
+
+    def replace(self, old, new_parts):
+        # list.index beats rebuilding the position lookup on every split
+        i = self._leaves.index(old)
+        self._leaves[i:i + 1] = new_parts
+        self._pos = None
+        self.touch()
+
+        self._remove_edges(old)
+        for p in new_parts:
+            self._add_edges(p)
+
+    def insert_after(self, part, new_part):
+        i = self._leaves.index(part)
+        self._leaves.insert(i + 1, new_part)
+        self._pos = None
+        self.touch()
+
+        self._add_edges(new_part)
+
+    def remove(self, part):
+        start, end = self.span(part)
+        for p in self._leaves[start:end]:
+            self._remove_edges(p)
+        del self._leaves[start:end]
+        self._pos = None
+        self.touch()
+
+    # -- edges -- #
+
+    def _add_edges(self, part):
+        dims = part.dims
+        self._edge_dims[part] = dims
+        for i in (0, 1):
+            self._starts[i].setdefault(dims[i], {})[part] = None
+            self._ends[i].setdefault(dims[i] + dims[i + 2], {})[part] = None
+
+    def _remove_edges(self, part):
+        dims = self._edge_dims.pop(part, None)
+        if dims is None:
+            return
+        for i in (0, 1):
+            for buckets, coord in ((self._starts[i], dims[i]),
+                                   (self._ends[i], dims[i] + dims[i + 2])):
+                bucket = buckets[coord]
+                del bucket[part]
+                if not bucket:
+                    del buckets[coord]
+
+    def moved(self, part):
+        # only leaves we know about have edges
+        old_dims = self._edge_dims.get(part)
+        if old_dims is None or old_dims == part.dims:
+            return
+        self._remove_edges(part)
+        self._add_edges(part)
+        self.touch()
+
+    def starting_at(self, i, coord):
+        return list(self._starts[i].get(coord, ()))
+
+    def ending_at(self, i, coord):
+        return list(self._ends[i].get(coord, ()))
+
+
+# traversal helpers
+# these use an explicit stack so deep trees can't hit the recursion limit
+def iter_pre_order(root):
+    stack = [root]
+    while stack:
+        part = stack.pop()
+        yield part
+        stack.extend(reversed(part.children))
+
+
+def iter_post_order(root):
+    stack = [(root, False)]
+    while stack:
+        part, seen = stack.pop()
+        if seen or not part.children:
+            yield part
+        else:
+            stack.append((part, True))
+            stack.extend((c, False) for c in reversed(part.children))
+
+
+def iter_leaves(root):
+    stack = [root]
+    while stack:
+        part = stack.pop()
+        if part.children:
+            stack.extend(reversed(part.children))
+        else:
+            yield part
+
+
+def first_leaf(part):
+    while part.children:
+        part = part.children[0]
+    return part
+
+
+def last_leaf(part):
+    while part.children:
+        part = part.children[-1]
+    return part
+
+
+# layout helpers
+def part_depth(part):
+    depth = 0
+    while part.parent is not None:
+        part = part.parent
+        depth += 1
+    return depth
+
+
+def relayout_parts(parts):
+    # resize everything below the given partitions (parents first)
+    # subtrees whose dims came out the same are left alone
+    expanded = set()
+    touched = 0
+    for part in parts:
+        stack = [part]
+        while stack:
+            p = stack.pop()
+            if p in expanded:
+                continue
+            expanded.add(p)
+            for c in p:
+                old_dims = c.dims
+                c.resize_from_parent()
+                touched += 1
+                if c.dims != old_dims:
+                    stack.append(c)
+    return touched
+
+
 # displays
 def calc_display_nav(disp_dims):
 
@@ -474,6 +803,36 @@ class Config:
         self.PRETTY_WINS = False
         self.FONT = ('IBM 3161', 14)
 
+        # how many msgs can wait to be handled & how often to check for them (ms)
+        self.EVENT_QUEUE_SIZE = 256
+        self.EVENT_POLL = self.FRAME_DUR
+
+        # undo/redo steps kept per workspace
+        self.UNDO_DEPTH = 50
+
+        # where to keep layouts between restarts (None to not bother)
+        # e.g. os.path.expanduser('~/.bbwm_layout.json')
+        self.LAYOUT_FILE = None
+        # wait this long (ms) after a change before saving
+        self.SAVE_DELAY = 1000
+
+        # tile every window that's already open when starting
+        self.ADOPT_ON_START = False
+
+        # windows to leave alone, a list of Rule from bbwm/rules.py
+        # e.g. Rule(title='.* - Mozilla Firefox'), Rule(process='vlc.exe'),
+        #      Rule(cls='#32770', exstyle=0x80)  # tool window dialogs
+        self.IGNORE_RULES = DEFAULT_RULES + []
+
+        # how long (s) to trust cached window titles/rects/styles
+        # (changes we hear about are picked up right away)
+        self.WIN_INFO_TTL = 5.0
+
+        # debug
+        # time every msg from receiving it until it's drawn (dumped w/ win+shift+r)
+        self.TRACE_LATENCY = False
+        self.TRACE_WINDOW = 200
+
         # colors
         self.TRANSPARENT_COLOR = '#0DEAD0'
 
@@ -1,80 +1,137 @@
 import tkinter as tk
+import tkinter.font as tkfont
 import math
+import time
 
-from queue import Queue
+from collections import Counter
+
+from .trace import Tracer
 
 
 class BBDraw:
-    def __init__(self, root, monitor_bbox, c):
+    def __init__(self, root, monitors, c):
+        # monitors are the displays' dims, each gets its own overlay when first drawn on
         self.c = c  # config
 
-        self.m_bbox = monitor_bbox
+        self._set_monitors(monitors)
 
+        # the root is only around for its event loop
         self.root = root
         self.root.title('__bbwm__')
-        self.root.attributes('-alpha', self.c.DEFAULT_OPACITY)
-        self.root.wm_attributes("-transparentcolor", self.c.TRANSPARENT_COLOR)
-        self.root.overrideredirect(True)
-
-        self.max_w, self.max_h = self.m_bbox[2] - self.m_bbox[0], self.m_bbox[3] - self.m_bbox[1]
-        w, h = self.max_w + 2 * c.OFF_SCREEN, self.max_h + 2 * c.OFF_SCREEN
-        x, y = self.m_bbox[0] - c.OFF_SCREEN, self.m_bbox[1] - c.OFF_SCREEN
-        self.root.geometry('%dx%d+%d+%d' % (w, h, x, y))
-        self._x_o, self._y_o = -x, -y
+        self.root.withdraw()
 
         self.part_width = max(min(self.c.INNER_SPACING_X, self.c.INNER_SPACING_Y) - 2, 2)
+        self.text = TextFitter(tkfont.Font(root=self.root, font=self.c.FONT).measure)
 
-        self.canvas = tk.Canvas(root, width=w, height=h, bg=self.c.TRANSPARENT_COLOR, highlightthickness=0)
-        self.canvas.pack()
+        # display index -> Surface
+        self.surfaces = {}
+        # the one being drawn on
+        self.surface = None
 
         # for resizing partitions
 
-        self._draw_job = None
         self._drag_data = {"x": 0, "y": 0, "item": None, 'dir': None}
 
-        self.line_to_part = {}
-
-        self._last_split = None
-        self._last_part = None
-
         self.resplit_fun = None
+        # called while dragging, (part, ratio)
+        self.live_resplit_fun = None
         self.unfocus_fun = None
-
-        for d in ['h', 'v']:
-            self.canvas.tag_bind(d, "<ButtonPress-1>", self.drag_begin)
-            self.canvas.tag_bind(d, "<ButtonRelease-1>", self.drag_end)
-            self.canvas.tag_bind(d, "<B1-Motion>", self.drag)
+        # gets each new overlay's window id
+        self.topmost_fun = None
 
         # for menu stuff
 
         self._click_to_fun = []
         self._button_binds = []
+        self._menu_surface = None
+
+        self.tracer = Tracer()
 
-        self._job_queue = Queue()
+    # -- surfaces -- #
+
+    def _set_monitors(self, monitors):
+        self.monitors = list(monitors)
+        xs = [d.x for d in self.monitors] + [d.r_x for d in self.monitors]
+        ys = [d.y for d in self.monitors] + [d.b_y for d in self.monitors]
+        self.m_bbox = [min(xs), min(ys), max(xs), max(ys)]
+        self.max_w, self.max_h = self.m_bbox[2] - self.m_bbox[0], self.m_bbox[3] - self.m_bbox[1]
+
+    def change_monitors(self, monitors):
+        # overlays get made again (for the new displays) next time they're drawn on
+        self.reset_menu()
+        for s in self.surfaces.values():
+            s.animator.cancel()
+            s.window.destroy()
+        self.surfaces = {}
+        self.surface = None
+        self._menu_surface = None
+        self._set_monitors(monitors)
+
+    def _get_surface(self, i):
+        if i not in self.surfaces:
+            s = Surface(self.root, self.monitors[i], self.c)
+            for d in ['h', 'v']:
+                s.canvas.tag_bind(d, "<ButtonPress-1>", self.drag_begin)
+                s.canvas.tag_bind(d, "<ButtonRelease-1>", self.drag_end)
+                s.canvas.tag_bind(d, "<B1-Motion>", self.drag)
+            if self.topmost_fun is not None:
+                self.topmost_fun(s.window.winfo_id())
+            self.surfaces[i] = s
+        return self.surfaces[i]
+
+    def display_at(self, x, y):
+        for i, d in enumerate(self.monitors):
+            if d.x <= x < d.r_x and d.y <= y < d.b_y:
+                return i
+        return min(range(len(self.monitors)), key=lambda i: self.monitors[i].distance_to(x, y))
+
+    def pointer_display(self):
+        return self.display_at(self.root.winfo_pointerx(), self.root.winfo_pointery())
+
+    def _route(self, display):
+        # draw on display (or wherever the mouse is) from now on
+        if display is None:
+            display = self.pointer_display()
+        s = self._get_surface(display)
+        if self.surface is not None and self.surface is not s:
+            # whatever the last one was doing is over
+            self.surface.animator.start('fade_out', [self.fade_out()])
+        self.surface = s
+        return s
+
+    @property
+    def canvas(self):
+        return self.surface.canvas
+
+    @property
+    def scene(self):
+        return self.surface.scene
 
     # -- helper calcs -- #
 
     def _dims_to_canvas_coords(self, dims):
         x, y, w, h = dims.x, dims.y, dims.w, dims.h
-        x, y = x + self._x_o, y + self._y_o
+        x, y = x + self.surface.x_o, y + self.surface.y_o
         rx = x + w
         by = y + h
         return x, y, rx, by
 
-    def _calc_split_line(self, part):
+    def _calc_split_line(self, part, r=None):
         dims, split = part.dims, part.split
+        if r is None:
+            r = split.r
         d_i = int(split.d == 'h')
         is_x, is_y = self.c.INNER_SPACING_X, self.c.INNER_SPACING_Y
 
         x, y, w, h = dims.x, dims.y, dims.w, dims.h
         # x, y = x + self._x_o + is_x / 2, y + self._y_o + is_y / 2
-        x, y = x + self._x_o, y + self._y_o
+        x, y = x + self.surface.x_o, y + self.surface.y_o
         # w, h = w - is_x, h - is_y
 
         l_thicc = [is_x, is_y][d_i]
 
-        rx = x + math.floor((w) * split.r) * (d_i) + (w) * (1 - d_i)
-        by = y + math.floor((h) * split.r) * (1 - d_i) + (h) * (d_i)
+        rx = x + math.floor((w) * r) * (d_i) + (w) * (1 - d_i)
+        by = y + math.floor((h) * r) * (1 - d_i) + (h) * (d_i)
 
         # still not quite...
         if d_i:
@@ -84,30 +141,44 @@ class BBDraw:
 
         return x, y, rx, by, l_thicc
 
-    def _calc_mon_offset(self):
-        # some sort of max bbox scaling probably better
-
+    def _calc_mon_offset(self, rows=0):
+        # top left of the minimap (& the rows listed under it) in the surface's coords
+        # centered on the mouse, but all of it on the display being drawn on
+        dims = self.surface.dims
+        w, h = self.max_w // 10, self.max_h // 10 + 5 + 27 * rows
         x, y = self.root.winfo_pointerx(), self.root.winfo_pointery()
-        x, y = x + self._x_o, y + self._y_o
-        # x & y are relative top top left corner of all monitors
-        # so that midpoint will be where your mouse is
-        x, y = x - self.max_w // 20, y - self.max_h // 20
-        return x, y
+        if not (dims.x <= x < dims.r_x and dims.y <= y < dims.b_y):
+            # mouse is on another display
+            x, y = dims.midpoint()
+        x = max(dims.x, min(x - self.max_w // 20, dims.r_x - w))
+        y = max(dims.y, min(y - self.max_h // 20, dims.b_y - h))
+        return x + self.surface.x_o, y + self.surface.y_o
 
     # -- helper funs -- #
 
-    def clear_screen(self):
-        self.canvas.delete('all')
-        del self.line_to_part
-        self.line_to_part = {}
+    def begin_frame(self):
+        # everything that should be on screen gets drawn between this & end_frame
+        self.scene.begin_frame()
+        self.surface.line_to_part = {}
+        self.surface.last_split = None
+
+    def end_frame(self):
+        return self.scene.end_frame()
 
-        self._last_split = None
-        self._last_part = None
+    def draw_stats(self):
+        tor = {i: s.stats() for i, s in sorted(self.surfaces.items())}
+        tor['text'] = dict(self.text.stats)
+        return tor
+
+    def _bind_focus_out(self):
+        self.surface.window.bind('<FocusOut>', self.lost_focus)
+        self._menu_surface = self.surface
 
     def lost_focus(self, e):
+        if self._menu_surface is not None:
+            self._menu_surface.window.unbind('<FocusOut>')
         self.reset_menu()
         self.fo_draw()
-        self.root.unbind('<FocusOut>')
         if self.unfocus_fun is not None:
             self.unfocus_fun()
 
@@ -118,13 +189,15 @@ class BBDraw:
         return new_fun
 
     def reset_menu(self, tag_to_fun=[]):
-
-        for kb in self._button_binds:
-            self.canvas.unbind(kb)
+        # binds live on whichever overlay had the last menu
+        old = self._menu_surface if self._menu_surface is not None else self.surface
+        if old is not None:
+            for kb in self._button_binds:
+                old.canvas.unbind(kb)
+            for tag in self._click_to_fun:
+                old.canvas.tag_unbind(tag, "<ButtonPress-1>")
         self._button_binds = []
-
-        for tag in self._click_to_fun:
-            self.canvas.tag_unbind(tag, "<ButtonPress-1>")
+        self._menu_surface = self.surface
 
         self._click_to_fun = []
         for (tag, fun) in tag_to_fun:
@@ -133,22 +206,17 @@ class BBDraw:
 
     # -- basic draws -- #
 
-    def write_centered_text(self, x1, x2, y1, y2, text, tags=[]):
-        self.canvas.create_text((x1 + x2) // 2, (y1 + y2) // 2,
-                                fill=self.c.BORDER_HIGHLIGHT_COLOR,
-                                font=self.c.FONT,
-                                text=text, tags=tags)
+    def write_centered_text(self, key, x1, x2, y1, y2, text, tags=''):
+        return self.scene.draw('text', key, ((x1 + x2) // 2, (y1 + y2) // 2),
+                               fill=self.c.BORDER_HIGHLIGHT_COLOR,
+                               font=self.c.FONT,
+                               text=text, tags=tags)
 
-    def draw_part(self, dims, current, single=False):
+    def draw_part(self, part, dims, current):
         outline = self.c.BORDER_HIGHLIGHT_COLOR if current else self.c.BORDER_COLOR
 
-        rect = self.canvas.create_rectangle(*self._dims_to_canvas_coords(dims),
-                                            outline=outline, width=self.part_width)
-
-        if single:
-            if self._last_part is not None:
-                self.canvas.delete(self._last_part)
-            self._last_part = rect
+        self.scene.draw('rectangle', ('part', part), self._dims_to_canvas_coords(dims),
+                        outline=outline, width=self.part_width)
 
     def draw_split(self, part, single=False, inactive=True):
         split = part.split
@@ -158,17 +226,14 @@ class BBDraw:
 
         fill = self.c.BORDER_HIGHLIGHT_COLOR if inactive else self.c.SELECTION_COLOR
 
-        new_line = self.canvas.create_line(x, y, rx, by,
-                                           fill=fill,
-                                           activefill=self.c.BORDER_COLOR,
-                                           width=w,
-                                           tags=(split.d if split.t is None else '')
-                                           )
+        new_line = self.scene.draw('line', ('split', part), (x, y, rx, by),
+                                   fill=fill,
+                                   activefill=self.c.BORDER_COLOR,
+                                   width=w,
+                                   tags=split.d)
         if single:
-            if self._last_split is not None:
-                self.canvas.delete(self._last_split)
-            self._last_split = new_line
-        self.line_to_part[new_line] = part
+            self.surface.last_split = new_line
+        self.surface.line_to_part[new_line] = part
 
     def draw_monitor(self, dims, x_o, y_o, text=''):
 
@@ -179,33 +244,34 @@ class BBDraw:
         x2 = x1 + dims.w // 10
         y2 = y1 + dims.h // 10
 
-        self.canvas.create_rectangle(x1, y1, x2, y2,
-                                     outline=self.c.BORDER_HIGHLIGHT_COLOR,
-                                     fill=self.c.BORDER_COLOR,
-                                     width=2)
-        self.write_centered_text(x1, x2, y1, y2, text)
+        self.scene.draw('rectangle', ('monitor', dims), (x1, y1, x2, y2),
+                        outline=self.c.BORDER_HIGHLIGHT_COLOR,
+                        fill=self.c.BORDER_COLOR,
+                        width=2)
+        self.write_centered_text(('monitor_text', dims), x1, x2, y1, y2, text)
 
-    def draw_win(self, dims, x_o, y_o, i, active=False):
+    def draw_win(self, part, dims, x_o, y_o, i, active=False):
         x1 = x_o + (dims.x - self.m_bbox[0]) // 10
         y1 = y_o + (dims.y - self.m_bbox[1]) // 10
 
         x2 = x1 + dims.w // 10
         y2 = y1 + dims.h // 10
 
-        self.canvas.create_rectangle(x1 + 1, y1 + 1, x2 - 2, y2 - 2,
-                                     outline=self.c.BORDER_HIGHLIGHT_COLOR,
-                                     fill=self.c.BORDER_HIGHLIGHT_COLOR if active else self.c.SELECTION_COLOR)
-        self.write_centered_text(x1, x2, y1, y2, i)
+        self.scene.draw('rectangle', ('win', part), (x1 + 1, y1 + 1, x2 - 2, y2 - 2),
+                        outline=self.c.BORDER_HIGHLIGHT_COLOR,
+                        fill=self.c.BORDER_HIGHLIGHT_COLOR if active else self.c.SELECTION_COLOR)
+        self.write_centered_text(('win_text', part), x1, x2, y1, y2, i)
 
     # -- splits -- #
 
-    def move_split(self, part, the_line=None):
+    def move_split(self, part, the_line=None, r=None):
+        # r if the split hasn't caught up yet
         if the_line is None:
-            the_line = self._last_split
+            the_line = self.surface.last_split
         if the_line is None:
             return
-        x, y, rx, by, _ = self._calc_split_line(part)
-        self.canvas.coords(the_line, x, y, rx, by)
+        x, y, rx, by, _ = self._calc_split_line(part, r)
+        self.scene.move_to(the_line, (x, y, rx, by))
 
     def split_menu(self, split_funs):
         for s_kb, s_fun in split_funs:
@@ -216,13 +282,13 @@ class BBDraw:
         self._button_binds.append('<Escape>')
 
         self.canvas.focus_force()
-        self.root.bind('<FocusOut>', self.lost_focus)
+        self._bind_focus_out()
 
     # -- tilescheme menu -- #
 
     def draw_menu(self, tags_to_funs):
         x, y = self.root.winfo_pointerx(), self.root.winfo_pointery()
-        x, y = x + self._x_o, y + self._y_o
+        x, y = x + self.surface.x_o, y + self.surface.y_o
         w = self.part_width // 2
 
         dxy = [[-1, -1], [1, -1],
@@ -232,19 +298,18 @@ class BBDraw:
             dxdy = dxy[i]
             x2, y2 = x + 75 * dxdy[0], y + 75 * dxdy[1]
             tag = tags_to_funs[i][0]
-            self.canvas.create_rectangle(min(x, x2), min(y, y2),
-                                         max(x, x2), max(y, y2),
-                                         outline=self.c.BORDER_HIGHLIGHT_COLOR,
-                                         fill=self.c.BORDER_COLOR,
-                                         width=w,
-                                         tags=(tag))
-            self.write_centered_text(x, x2, y, y2, tag, tags=(tag))
+            self.scene.draw('rectangle', ('menu', i), (min(x, x2), min(y, y2), max(x, x2), max(y, y2)),
+                            outline=self.c.BORDER_HIGHLIGHT_COLOR,
+                            fill=self.c.BORDER_COLOR,
+                            width=w,
+                            tags=tag)
+            self.write_centered_text(('menu_text', i), x, x2, y, y2, tag, tags=tag)
 
         self.reset_menu(tags_to_funs)
-        self.root.bind('<FocusOut>', self.lost_focus)
+        self._bind_focus_out()
 
     def draw_menu_list(self, menu_list, disp_list, x_o, y_o, cur_i):
-        cl = CanvasList(self.c, self.canvas, cur_i)
+        cl = CanvasList(self.c, self.scene, cur_i)
 
         x1 = x_o
         x2 = x_o + self.max_w // 10
@@ -256,15 +321,14 @@ class BBDraw:
                 self._button_binds.append(m_kb)
 
             fill = self.c.SELECTION_COLOR if i == cur_i else self.c.BORDER_COLOR
-            new_row = self.canvas.create_rectangle(x1, n_y, x2, n_y + 23,
-                                                   outline=self.c.BORDER_HIGHLIGHT_COLOR,
-                                                   fill=fill,
-                                                   width=1, tags=('list_row'))
-            self.write_centered_text(x1, x1 + 25, n_y, n_y + 23, m_kb)
-            t_text = m_title
-            if len(t_text) > 35:
-                t_text = '{}..'.format(t_text[:33])
-            self.write_centered_text(x1, x2, n_y, n_y + 23, t_text)
+            new_row = self.scene.draw('rectangle', ('row', i), (x1, n_y, x2, n_y + 23),
+                                      outline=self.c.BORDER_HIGHLIGHT_COLOR,
+                                      fill=fill,
+                                      width=1)
+            self.write_centered_text(('row_kb', i), x1, x1 + 25, n_y, n_y + 23, m_kb)
+            # it's centered, so leave room for the key on both sides
+            t_text = self.text.fit(m_title, x2 - x1 - 2 * 30)
+            self.write_centered_text(('row_title', i), x1, x2, n_y, n_y + 23, t_text)
             cl.add_row(new_row, m_fun)
             n_y += 27
 
@@ -273,7 +337,7 @@ class BBDraw:
             self._button_binds.append(d_kb)
 
         self.canvas.focus_force()
-        self.root.bind('<FocusOut>', self.lost_focus)
+        self._bind_focus_out()
         self.canvas.bind('<Escape>', self.lost_focus)
 
         self.canvas.bind('<Return>', cl.pick_selected)
@@ -284,35 +348,14 @@ class BBDraw:
 
     # -- fading -- #
 
-    def _fade(self, _to, step):
-
-        progress = self.root.attributes('-alpha')
-        progress += step
-        self.root.attributes('-alpha', progress)
-
-        if (step < 0 and progress <= _to) or (step >= 0 and progress >= _to):
-            return True
-
     def fade_out(self):
-        step = -self.c.DEFAULT_OPACITY / self.c.FADE_N
-
-        return self._fade(0, step)
+        return ('fade', 0)
 
     def fade_in(self):
-        _to = self.c.DEFAULT_OPACITY
-        step = _to / self.c.FADE_N
-
-        return self._fade(_to, step)
+        return ('fade', self.c.DEFAULT_OPACITY)
 
     def wait_pls(self):
-
-        def wait_fun():
-            wait_fun.left -= 1
-            return wait_fun.left <= 0
-
-        wait_fun.left = self.c.CLEAR_TIMEOUT
-
-        return wait_fun
+        return ('wait', self.c.CLEAR_TIMEOUT * self.c.FRAME_DUR)
 
     # -- dragging -- #
 
@@ -324,34 +367,39 @@ class BBDraw:
         self._drag_data["y"] = event.y
         self._drag_data["dir"] = self.canvas.gettags(item)[0]
 
-        self.canvas.tag_raise(item)
+        self.scene.raise_item(item)
+
+    def _drag_ratio(self, assoc_part):
+        lx, ty, rx, by = self._dims_to_canvas_coords(assoc_part.dims)
+        # compute new split ratio
+        if self._drag_data["dir"] == 'h':
+            new_r = (self._drag_data["x"] - lx) / (rx - lx)
+        elif self._drag_data["dir"] == 'v':
+            new_r = (self._drag_data["y"] - ty) / (by - ty)
+        else:
+            return
+        return max(min(new_r, 1 - self.c.MIN_RATIO), self.c.MIN_RATIO)
 
     def drag_end(self, event):
         the_line = self._drag_data["item"]
-        if (the_line is None) or (the_line not in self.line_to_part):
+        if (the_line is None) or (the_line not in self.surface.line_to_part):
             return
         if self.resplit_fun is not None:
-            assoc_part = self.line_to_part[the_line]
-            lx, ty, rx, by = self._dims_to_canvas_coords(assoc_part.dims)
-            # compute new split ratio
-            if self._drag_data["dir"] == 'h':
-                new_r = (self._drag_data["x"] - lx) / (rx - lx)
-            elif self._drag_data["dir"] == 'v':
-                new_r = (self._drag_data["y"] - ty) / (by - ty)
-            else:
+            assoc_part = self.surface.line_to_part[the_line]
+            new_r = self._drag_ratio(assoc_part)
+            if new_r is None:
                 return
-            new_r = max(min(new_r, 1 - self.c.MIN_RATIO), self.c.MIN_RATIO)
             # update it with the fun
-            self.resplit_fun(assoc_part, new_r, the_line != self._last_split)
+            self.resplit_fun(assoc_part, new_r, the_line != self.surface.last_split)
 
         self._drag_data = {"x": 0, "y": 0, "item": None, 'dir': None}
 
     def drag(self, event):
         d = self._drag_data["dir"]
         the_line = self._drag_data["item"]
-        if the_line not in self.line_to_part:
+        if the_line not in self.surface.line_to_part:
             return
-        assoc_part = self.line_to_part[the_line]
+        assoc_part = self.surface.line_to_part[the_line]
         lx, ty, rx, by = self._dims_to_canvas_coords(assoc_part.dims)
 
         if d == 'h':
@@ -373,99 +421,302 @@ class BBDraw:
         else:
             return
 
-        self.canvas.move(the_line, delta_x, delta_y)
+        self.scene.move(the_line, delta_x, delta_y)
 
-    # -- draw queue -- #
-    def enqueue_draw(self, job_type, job_funs):
-        new_job = DrawJob(job_type, job_funs)
-
-        was_empty = self._job_queue.empty()
-        self._job_queue.put(new_job)
-
-        if was_empty:
-            # start the queue
-            self.next_draw()
-            return
+        # windows follow along (as often as they can keep up)
+        if self.live_resplit_fun is not None:
+            self.live_resplit_fun(assoc_part, self._drag_ratio(assoc_part))
 
-        last_job = self._job_queue.queue[-2]
-        last_job.cancel_remaining()
+    # -- draw queue -- #
+    def enqueue_draw(self, job_type, steps, display=None):
+        # whatever was running is dropped
+        self._route(display).animator.start(job_type, steps)
 
-    def next_draw(self):
-        if self._job_queue.empty():
-            return
+    def fo_draw(self):
+        if self.surface is not None:
+            self.surface.animator.start('fade_out', [self.fade_out()])
+
+    def _traced(self, pre_steps, post_steps):
+        # mark the msg's trace once drawing starts & once it's faded in
+        markers = self.tracer.draw_markers()
+        if markers is None:
+            return pre_steps + post_steps
+        start, end = markers
+        return [('call', start)] + pre_steps + [('call', end)] + post_steps
+
+    def _on(self, surface, meat_fun):
+        # draw on the overlay the job was for, even if another one's been picked since
+        def wrapped():
+            self.surface = surface
+            meat_fun()
+        return wrapped
 
-        cur_job = self._job_queue.queue[0]
+    def fofi_draw(self, job_type, meat_fun, display=None):
+        # fade out -> (__) -> fade in
+        s = self._route(display)
+        steps = self._traced([self.fade_out(), ('call', self._on(s, meat_fun)), self.fade_in()], [])
+        s.animator.start(job_type, steps)
 
-        next_fun = cur_job.next_up()
-        if next_fun is None:
-            self._job_queue.get()
-            self.next_draw()
+    def fofifo_draw(self, job_type, meat_fun, display=None):
+        # fade out -> (__) -> fade in -> wait -> fade out
+        s = self._route(display)
+        steps = self._traced([self.fade_out(), ('call', self._on(s, meat_fun)), self.fade_in()],
+                             [self.wait_pls(), self.fade_out()])
+        s.animator.start(job_type, steps)
+
+
+class TextFitter:
+    # cuts text down to fit a width (for one font)
+    # widths of single glyphs & whole strings are cached, and so is every cut,
+    # so a menu that's opened over & over doesn't measure anything again
+    def __init__(self, measure, suffix='..', max_cached=4096):
+        self.measure = measure
+        self.suffix = suffix
+        self.max_cached = max_cached
+
+        self._glyphs = {}
+        self._widths = {}
+        # (text, width) -> cut text
+        self._fits = {}
+        self.stats = Counter()
+
+    def _cached(self, cache, text):
+        w = cache.get(text)
+        if w is None:
+            if len(cache) >= self.max_cached:
+                cache.clear()
+            w = cache[text] = self.measure(text)
+            self.stats['measured'] += 1
+        return w
+
+    def width(self, text):
+        return self._cached(self._widths, text)
+
+    def glyph_width(self, ch):
+        return self._cached(self._glyphs, ch)
+
+    def fit(self, text, max_w):
+        key = (text, max_w)
+        tor = self._fits.get(key)
+        if tor is not None:
+            self.stats['hits'] += 1
+            return tor
+        if len(self._fits) >= self.max_cached:
+            self._fits.clear()
+        tor = self._fits[key] = self._fit(text, max_w)
+        return tor
+
+    def _fit(self, text, max_w):
+        if self.width(text) <= max_w:
+            return text
+
+        def fits(n):
+            return self.width(text[:n] + self.suffix) <= max_w
+
+        # first guess from adding up glyphs (spot on unless the font kerns)
+        room = max_w - self.width(self.suffix)
+        guess = 0
+        for ch in text:
+            room -= self.glyph_width(ch)
+            if room < 0:
+                break
+            guess += 1
+
+        # then the longest prefix that actually fits, lo always does
+        # (or is nothing, then it's just the suffix)
+        lo, hi = 0, len(text) - 1
+        guess = min(guess, hi)
+        if fits(guess):
+            if guess == hi or not fits(guess + 1):
+                return text[:guess] + self.suffix
+            lo = guess + 1
         else:
-            job_done = next_fun()
-            if bool(job_done):
-                cur_job.last_done()
-                self.next_draw()
+            hi = guess - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if fits(mid):
+                lo = mid
             else:
-                self.root.after(self.c.FRAME_DUR, self.next_draw)
+                hi = mid - 1
+        return text[:lo] + self.suffix
 
-    def meat_wrapper(self, meat_fun):
 
-        def wrapped():
-            meat_fun()
-            return True
+class Surface:
+    # one overlay window over one display (plus a bit off screen)
+    # with its own canvas, items & fading
+    def __init__(self, root, dims, c):
+        self.dims = dims
 
-        return wrapped
-
-    def fo_draw(self):
-        self.enqueue_draw('fade_out', [self.fade_out])
+        self.window = tk.Toplevel(root)
+        self.window.title('__bbwm__')
+        self.window.attributes('-alpha', 0)
+        self.window.wm_attributes("-transparentcolor", c.TRANSPARENT_COLOR)
+        self.window.overrideredirect(True)
 
-    def fofi_draw(self, job_type, meat_fun):
-        # fade out -> (__) -> fade in
-        all_funs = [self.fade_out, self.meat_wrapper(meat_fun),
-                    self.fade_in]
+        w, h = dims.w + 2 * c.OFF_SCREEN, dims.h + 2 * c.OFF_SCREEN
+        x, y = dims.x - c.OFF_SCREEN, dims.y - c.OFF_SCREEN
+        self.window.geometry('%dx%d+%d+%d' % (w, h, x, y))
+        # screen -> canvas coords
+        self.x_o, self.y_o = -x, -y
 
-        self.enqueue_draw(job_type, all_funs)
+        self.canvas = tk.Canvas(self.window, width=w, height=h, bg=c.TRANSPARENT_COLOR, highlightthickness=0)
+        self.canvas.pack()
+        self.scene = Scene(self.canvas)
 
-    def fofifo_draw(self, job_type, meat_fun):
-        # fade out -> (__) -> fade in -> wait -> fade out
-        all_funs = [self.fade_out, self.meat_wrapper(meat_fun),
-                    self.fade_in, self.wait_pls(), self.fade_out]
-        self.enqueue_draw(job_type, all_funs)
+        # starts out invisible
+        self.animator = Animator(root, c.FRAME_DUR, c.FADE_N * c.FRAME_DUR,
+                                 self.set_alpha, c.DEFAULT_OPACITY, 0)
 
+        # split lines that can be dragged
+        self.line_to_part = {}
+        self.last_split = None
 
-class DrawJob:
-    def __init__(self, job_type, funs):
-        """
-        pre/post funs are for fading out/in
-        meat_fun is the meat of the drawing job
+    def set_alpha(self, alpha):
+        self.window.attributes('-alpha', alpha)
 
-        eventually draw jobs of the same type can have more complex behavior
-        (recoloring things instead of clearing screen & redrawing))
-        """
-        self.job_type = job_type
+    def stats(self):
+        return {'last_frame': dict(self.scene.frame), 'total': dict(self.scene.totals),
+                'frames': self.scene.frames, 'animation': self.animator.report()}
 
-        self._funs = funs
-        self.last_fun_i = -1
 
-    def next_up(self):
-        funs = [(i, f) for i, f in enumerate(self._funs) if f is not None]
-        if len(funs) == 0:
+class Animator:
+    # runs draw jobs off a frame clock, one job at a time (there's only one overlay)
+    # a job is a list of steps:
+    #   ('fade', to_alpha) - fade from wherever we are, a full fade takes fade_dur ms
+    #   ('call', fun)      - just call it
+    #   ('wait', ms)       - do nothing for a bit
+    # fades are worked out from the time that's passed, so if we're late
+    # frames get dropped instead of the whole thing slowing down
+    def __init__(self, root, frame_dur, fade_dur, set_alpha, full_alpha=1.0, alpha=None):
+        self.root = root
+        self.frame_dur = frame_dur
+        self.fade_dur = fade_dur
+        self.set_alpha = set_alpha
+        # what a full fade goes to/from
+        self.full_alpha = full_alpha
+        # kept here so we never have to ask the window
+        self.alpha = full_alpha if alpha is None else alpha
+
+        self.job_type = None
+        self._steps = []
+        self._step_i = 0
+        # when the current step started & what it started from (ms)
+        self._step_start = 0
+        self._from_alpha = self.alpha
+        self._tick_job = None
+        # when the next tick should happen
+        self._due = None
+
+        self.stats = Counter()
+        self.max_late = 0
+        self.max_work = 0
+
+    @staticmethod
+    def now():
+        return time.perf_counter() * 1000
+
+    @property
+    def running(self):
+        return self._step_i < len(self._steps)
+
+    def start(self, job_type, steps):
+        # replaces whatever's running, a fade picks up from the current alpha
+        if self.running:
+            self.stats['superseded'] += 1
+        self.job_type = job_type
+        self._steps = steps
+        self._step_i = 0
+        # a tick waiting out the old job's wait would hold this one up
+        self._cancel_tick()
+        self._begin_step(self.now())
+        self._run(self.now())
+
+    def cancel(self, job_type=None):
+        # stop the running job (if it's that type), alpha stays where it is
+        if job_type is not None and job_type != self.job_type:
             return
-        self.last_fun_i = funs[0][0]
-        return funs[0][1]
-
-    def last_done(self):
-        if self.last_fun_i > -1:
-            self._funs[self.last_fun_i] = None
-
-    def cancel_remaining(self):
-        for i in range(max(0, self.last_fun_i), len(self._funs)):
-            self._funs[i] = None
+        if self.running:
+            self.stats['cancelled'] += 1
+        self._steps = []
+        self._step_i = 0
+        self._cancel_tick()
+
+    def _cancel_tick(self):
+        if self._tick_job is not None:
+            self.root.after_cancel(self._tick_job)
+            self._tick_job = None
+
+    def _begin_step(self, t):
+        self._step_start = t
+        self._from_alpha = self.alpha
+
+    def _fade_time(self, to):
+        return self.fade_dur * abs(to - self._from_alpha) / self.full_alpha
+
+    def _run(self, t):
+        # do as many steps as fit in up to t
+        delay = self.frame_dur
+        while self.running:
+            kind, arg = self._steps[self._step_i]
+            if kind == 'call':
+                arg()
+                done_at = self._step_start
+            elif kind == 'fade':
+                if self.alpha == arg:
+                    self.stats['fades_skipped'] += 1
+                    done_at = self._step_start
+                else:
+                    dur = self._fade_time(arg)
+                    p = (t - self._step_start) / dur if dur > 0 else 1
+                    if p < 1:
+                        self._alpha_to(self._from_alpha + (arg - self._from_alpha) * p)
+                        break
+                    self._alpha_to(arg)
+                    done_at = self._step_start + dur
+            else:
+                done_at = self._step_start + arg
+                if t < done_at:
+                    # nothing to draw until it's over
+                    delay = max(self.frame_dur, int(done_at - t))
+                    break
+            self._step_i += 1
+            # next step starts when this one should have ended, not when we noticed
+            self._begin_step(min(done_at, t))
+
+        if self.running and self._tick_job is None:
+            self._due = t + delay
+            self._tick_job = self.root.after(delay, self._tick)
+
+    def _alpha_to(self, alpha):
+        if alpha != self.alpha:
+            self.alpha = alpha
+            self.set_alpha(alpha)
+
+    def _tick(self):
+        self._tick_job = None
+        t = self.now()
+
+        # how late this frame is & how many we skipped over because of it
+        late = t - self._due
+        self.stats['frames'] += 1
+        if late > self.frame_dur:
+            self.stats['overruns'] += 1
+            self.stats['dropped'] += int(late // self.frame_dur)
+        self.max_late = max(self.max_late, late)
+
+        self._run(t)
+        self.max_work = max(self.max_work, self.now() - t)
+
+    def report(self):
+        tor = dict(self.stats)
+        tor['max_late_ms'] = round(self.max_late, 2)
+        tor['max_work_ms'] = round(self.max_work, 2)
+        return tor
 
 
 class CanvasList:
-    def __init__(self, config, canvas, cur_i):
-        self.canvas = canvas
+    def __init__(self, config, scene, cur_i):
+        self.scene = scene
         self.c = config
 
         self.activate_funs = []
@@ -489,7 +740,209 @@ class CanvasList:
                 return
             self.cur_i = (self.cur_i + diff) % len(self.rows)
             # update drawing
-            self.canvas.itemconfig('list_row', fill=self.c.BORDER_COLOR)
-            self.canvas.itemconfig(self.rows[self.cur_i], fill=self.c.SELECTION_COLOR)
+            for i, row in enumerate(self.rows):
+                self.scene.configure(row, fill=self.c.SELECTION_COLOR if i == self.cur_i else self.c.BORDER_COLOR)
 
         return change_select
+
+
+class Scene:
+    # retained canvas items, keyed by what they show (mostly partitions)
+    # every frame says what should be on screen, items that didn't change
+    # are left alone and ones that weren't drawn get hidden & reused later
+    FRAME_STATS = ('created', 'updated', 'reused', 'hidden', 'restacked')
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+
+        # key -> [item, kind, coords, opts]
+        self._items = {}
+        self._item_keys = {}
+        # hidden items by (kind, option names), so reusing one never leaves stale options
+        self._spare = {}
+
+        # stacking order should be the drawing order, only fixed up when it isn't
+        # item -> how high up it is (new & raised items go on top)
+        self._z = {}
+        self._top = 0
+        self._order = []
+
+        self._drawn = set()
+        self.frame = dict.fromkeys(self.FRAME_STATS, 0)
+        self.totals = Counter()
+        self.frames = 0
+
+    def begin_frame(self):
+        self._drawn = set()
+        self._order = []
+        self.frame = dict.fromkeys(self.FRAME_STATS, 0)
+
+    def end_frame(self):
+        for key in [k for k in self._items if k not in self._drawn]:
+            item, kind, coords, opts = self._items.pop(key)
+            del self._item_keys[item]
+            self.canvas.itemconfigure(item, state='hidden')
+            self._spare.setdefault((kind, tuple(sorted(opts))), []).append((item, coords, opts))
+            self.frame['hidden'] += 1
+
+        zs = [self._z[item] for item in self._order]
+        if any(z1 > z2 for z1, z2 in zip(zs, zs[1:])):
+            for item in self._order:
+                self._to_top(item)
+            self.frame['restacked'] = len(self._order)
+
+        self.frames += 1
+        self.totals.update(self.frame)
+        return self.frame
+
+    def draw(self, kind, key, coords, **opts):
+        # kind is a canvas item type ('rectangle', 'line', 'text')
+        coords = tuple(coords)
+        self._drawn.add(key)
+
+        entry = self._items.get(key)
+        if entry is None:
+            spare = self._spare.get((kind, tuple(sorted(opts))))
+            if spare:
+                item, old_coords, old_opts = spare.pop()
+                self._update(item, coords, old_coords, opts, old_opts, state='normal')
+                self.frame['updated'] += 1
+            else:
+                item = getattr(self.canvas, 'create_' + kind)(*coords, **opts)
+                self._top += 1
+                self._z[item] = self._top
+                self.frame['created'] += 1
+            self._items[key] = [item, kind, coords, opts]
+            self._item_keys[item] = key
+        else:
+            item = entry[0]
+            if self._update(item, coords, entry[2], opts, entry[3]):
+                entry[2], entry[3] = coords, opts
+                self.frame['updated'] += 1
+            else:
+                self.frame['reused'] += 1
+
+        self._order.append(item)
+        return item
+
+    def _update(self, item, coords, old_coords, opts, old_opts, **extra):
+        changed = {k: v for k, v in opts.items() if old_opts.get(k) != v}
+        changed.update(extra)
+        if coords != old_coords:
+            self.canvas.coords(item, *coords)
+        if changed:
+            self.canvas.itemconfigure(item, **changed)
+        return bool(changed) or coords != old_coords
+
+    # -- touching up items between frames -- #
+
+    def _entry(self, item):
+        key = self._item_keys.get(item)
+        if key is not None:
+            return self._items[key]
+
+    def configure(self, item, **opts):
+        entry = self._entry(item)
+        if entry is None:
+            return
+        new_opts = dict(entry[3], **opts)
+        if self._update(item, entry[2], entry[2], new_opts, entry[3]):
+            entry[3] = new_opts
+
+    def move_to(self, item, coords):
+        entry = self._entry(item)
+        if entry is None:
+            return
+        coords = tuple(coords)
+        if self._update(item, coords, entry[2], entry[3], entry[3]):
+            entry[2] = coords
+
+    def move(self, item, dx, dy):
+        entry = self._entry(item)
+        if entry is None:
+            return
+        self.canvas.move(item, dx, dy)
+        entry[2] = tuple(v + (dy if i % 2 else dx) for i, v in enumerate(entry[2]))
+
+    def _to_top(self, item):
+        self.canvas.tag_raise(item)
+        self._top += 1
+        self._z[item] = self._top
+
+    def raise_item(self, item):
+        # (the drawing order gets put back next frame)
+        self._to_top(item)
+
+
+class NullDraw:
+    # stand-in for BBDraw when running without a screen (e.g. on the sim backend)
+    # draw jobs run right away, everything else is a no-op
+    def __init__(self, c):
+        self.c = c
+        self.root = None
+
+        self.resplit_fun = None
+        self.live_resplit_fun = None
+        self.unfocus_fun = None
+
+        self.tracer = Tracer()
+        self.draw_count = 0
+
+    def change_monitors(self, monitors):
+        pass
+
+    def _calc_mon_offset(self, rows=0):
+        return 0, 0
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def draw_stats(self):
+        return {'draws': self.draw_count}
+
+    def draw_part(self, part, dims, current):
+        pass
+
+    def draw_split(self, part, single=False, inactive=True):
+        pass
+
+    def draw_monitor(self, dims, x_o, y_o, text=''):
+        pass
+
+    def draw_win(self, part, dims, x_o, y_o, i, active=False):
+        pass
+
+    def move_split(self, part, the_line=None, r=None):
+        pass
+
+    def split_menu(self, split_funs):
+        pass
+
+    def draw_menu(self, tags_to_funs):
+        pass
+
+    def draw_menu_list(self, menu_list, disp_list, x_o, y_o, cur_i):
+        pass
+
+    def fo_draw(self):
+        pass
+
+    def pointer_display(self):
+        return 0
+
+    def fofi_draw(self, job_type, meat_fun, display=None):
+        self.draw_count += 1
+        markers = self.tracer.draw_markers()
+        if markers is None:
+            meat_fun()
+            return
+        start, end = markers
+        start()
+        meat_fun()
+        end()
+
+    def fofifo_draw(self, job_type, meat_fun, display=None):
+        self.fofi_draw(job_type, meat_fun, display)
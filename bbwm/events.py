@@ -0,0 +1,126 @@
+import queue
+import threading
+import time
+
+from collections import Counter, deque
+
+from .trace import percentile
+
+
+class EventQueue:
+    # bounded, thread-safe hand off from the msg thread to whoever handles msgs
+    # a full queue makes the msg thread wait (windows keeps queueing msgs for us meanwhile)
+    def __init__(self, maxsize=256, window=200):
+        self._q = queue.Queue(maxsize)
+        self.maxsize = maxsize
+
+        # put / handled / full (times the producer had to wait)
+        self.stats = Counter()
+        self.max_depth = 0
+        self._waits = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._q.qsize()
+
+    def put(self, msg, block=True):
+        # returns False if it's full (& not blocking)
+        item = (time.perf_counter(), msg)
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            if not block:
+                return False
+            self.stats['full'] += 1
+            self._q.put(item)
+        self.stats['put'] += 1
+        depth = self._q.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+
+    def get(self):
+        # (msg, time it was put) or None if there's nothing waiting
+        try:
+            t, msg = self._q.get_nowait()
+        except queue.Empty:
+            return
+        with self._lock:
+            self._waits.append(time.perf_counter() - t)
+        self.stats['handled'] += 1
+        return msg, t
+
+    def report(self):
+        with self._lock:
+            waits = sorted(self._waits)
+        tor = 'events: {} waiting (max {}/{}), {}'.format(
+            len(self), self.max_depth, self.maxsize, dict(self.stats))
+        if waits:
+            tor += ', wait ms p50 {:.2f} p99 {:.2f} max {:.2f}'.format(
+                percentile(waits, 50) * 1e3, percentile(waits, 99) * 1e3, waits[-1] * 1e3)
+        return tor
+
+
+SHELL_ACTIONS = ('new_win', 'close_win', 'focus_win', 'title_change', 'win_moved')
+
+
+def coalesce(events, tracked=()):
+    # drop msgs that don't matter by the end of a batch of [((action, hwnd), received), ...]
+    # a window's creates & closes come down to how it ended up compared to before the batch
+    # (tracked is the hwnds we had then), so ones that came & went unseen are ignored
+    # only the last focus & the last of any other msg per window counts
+    # hotkeys stay where they are & nothing gets moved past them
+    tor = []
+    segment = []
+    # hwnd -> open or not, for windows an earlier segment created/closed
+    opened = {}
+    for event in events:
+        if event[0][0] in SHELL_ACTIONS:
+            segment.append(event)
+        else:
+            tor.extend(_coalesce_segment(segment, tracked, opened))
+            tor.append(event)
+            segment = []
+    tor.extend(_coalesce_segment(segment, tracked, opened))
+    return tor
+
+
+def _coalesce_segment(events, tracked, opened):
+    # where each window's first create/close, last create, last close & last of anything else are
+    first_life, last_new, last_close, last_other = {}, {}, {}, {}
+    for i, ((action, hwnd), _) in enumerate(events):
+        if action == 'new_win':
+            first_life.setdefault(hwnd, action)
+            last_new[hwnd] = i
+        elif action == 'close_win':
+            first_life.setdefault(hwnd, action)
+            last_close[hwnd] = i
+        elif action != 'focus_win':
+            last_other[(action, hwnd)] = i
+
+    keep, gone = set(), set()
+    for hwnd, first in first_life.items():
+        ends_open = last_new.get(hwnd, -1) > last_close.get(hwnd, -1)
+        existed = opened.get(hwnd, hwnd in tracked)
+        opened[hwnd] = ends_open
+        if first == 'new_win' and not existed:
+            if ends_open:
+                keep.add(last_new[hwnd])
+            else:
+                # came & went
+                gone.add(hwnd)
+            continue
+        # the close has to get through, even if the hwnd is back (reused) by the end
+        if hwnd in last_close:
+            keep.add(last_close[hwnd])
+        if ends_open:
+            keep.add(last_new[hwnd])
+    keep.update(i for (_, hwnd), i in last_other.items() if hwnd not in gone)
+
+    last_focus = None
+    for i, ((action, hwnd), _) in enumerate(events):
+        if action == 'focus_win' and hwnd not in gone:
+            last_focus = i
+    keep.add(last_focus)
+
+    return [event for i, event in enumerate(events) if i in keep]
@@ -57,14 +57,27 @@ class Dims(namedtuple('Dims', ['x', 'y', 'w', 'h'])):
     def resize(self, d, r, i):
         if d == 'v':
             return self.split_v(r)[i]
+        elif d == 'n':
+            return self.split_n(r)[i]
         else:
             return self.split_h(r)[i]
 
     def resize_n(self, d, n, i):
+        # same as split_*_n(n)[i] without making all n of them
+        if n <= 2:
+            return (self.split_v() if d == 'v' else self.split_h())[i]
         if d == 'v':
-            return self.split_v_n(n)[i]
+            new_h = self.h // n
+            if i < n - 1:
+                return Dims(self.x, self.y + i * new_h, self.w, new_h)
+            final_h = self.h - (n - 1) * new_h
+            return Dims(self.x, self.y + self.h - final_h, self.w, final_h)
         else:
-            return self.split_h_n(n)[i]
+            new_w = self.w // n
+            if i < n - 1:
+                return Dims(self.x + i * new_w, self.y, new_w, self.h)
+            final_w = self.w - (n - 1) * new_w
+            return Dims(self.x + self.w - final_w, self.y, final_w, self.h)
 
     def midpoint(self):
         return self.x + (self.w // 2), self.y + (self.h // 2)
@@ -0,0 +1,134 @@
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+from .core import NO_CHILDREN, iter_post_order
+
+
+# immutable copy of one partition, children are snapshots too
+# an unchanged partition keeps handing out the same snapshot
+# so consecutive snapshots share everything but the path to what changed
+Snap = namedtuple('Snap', ['part', 'split', 'window', 'ts', 'children'])
+
+# a whole workspace, plus where we were in it & what the tiling schemes had counted
+WorkspaceSnap = namedtuple('WorkspaceSnap', ['root', 'cur_part', 'tile_scheme', 'ts_states'])
+
+
+def snapshot_part(root):
+    for part in iter_post_order(root):
+        children = tuple(c._snap for c in part.children)
+        old = part._snap
+        if (old is not None and old.split == part.split and old.window is part.window and
+                old.ts is part.assoc_ts and len(old.children) == len(children) and
+                all(a is b for a, b in zip(old.children, children))):
+            continue
+        part._snap = Snap(part, part.split, part.window, part.assoc_ts, children)
+    return root._snap
+
+
+def snapshot(ws):
+    root = snapshot_part(ws.children[0])
+    schemes = {}
+    for snap in _iter_snaps(root):
+        if snap.ts is not None:
+            schemes[id(snap.ts)] = snap.ts
+    schemes[id(ws.tile_scheme)] = ws.tile_scheme
+    ts_states = tuple((ts, tuple(sorted(vars(ts).items()))) for ts in schemes.values())
+    return WorkspaceSnap(root, ws.cur_part, ws.tile_scheme, ts_states)
+
+
+def _iter_snaps(root):
+    stack = [root]
+    while stack:
+        snap = stack.pop()
+        yield snap
+        stack.extend(snap.children)
+
+
+def restore(ws, ws_snap):
+    # puts the same partitions back together the way they were
+    # returns the windows that are tiled afterwards
+    for ts, state in ws_snap.ts_states:
+        ts.__dict__.update(state)
+    ws.tile_scheme = ws.assoc_ts = ws_snap.tile_scheme
+
+    # windows in there now lose their spots, restored ones get them back below
+    for part in ws.iter_leaves():
+        if part.window is not None:
+            part.window.part = None
+
+    windows = []
+    root = ws_snap.root.part
+    root.parent = None
+    root.index = 0
+    for snap in _iter_snaps(ws_snap.root):
+        part = snap.part
+        part.split = snap.split
+        part.assoc_ts = snap.ts
+        part.window = None
+        # (unless it's been tiled somewhere else since)
+        if snap.window is not None and snap.window.part is None:
+            part.window = snap.window
+            snap.window.part = part
+            windows.append(snap.window)
+        part.children = [c.part for c in snap.children] or NO_CHILDREN
+        for i, c in enumerate(part.children):
+            c.parent = part
+            c.index = i
+        part._snap = snap
+
+    ws.set_root(root, ws_snap.cur_part)
+    return windows
+
+
+def _same(s1, s2):
+    # unchanged trees are the very same snapshot
+    return s1.root is s2.root and s1.cur_part is s2.cur_part and s1.ts_states == s2.ts_states
+
+
+class History:
+    # undo/redo for one workspace
+    def __init__(self, depth=50):
+        self._undo = deque(maxlen=depth)
+        self._redo = []
+        # before a change that's still going on (see begin)
+        self._pending = None
+
+    def __len__(self):
+        return len(self._undo)
+
+    @contextmanager
+    def recording(self, ws):
+        # change ws inside this, it only counts if something changed
+        before = snapshot(ws)
+        yield
+        if self._pending is None:
+            self._push(ws, before)
+
+    def begin(self, ws):
+        # for changes that take a while (dragging a split around)
+        # everything until end() is one step, and recording() inside it doesn't count
+        if self._pending is None:
+            self._pending = snapshot(ws)
+
+    def end(self, ws):
+        before, self._pending = self._pending, None
+        if before is not None:
+            self._push(ws, before)
+
+    def _push(self, ws, before):
+        if not _same(before, snapshot(ws)):
+            self._undo.append(before)
+            self._redo = []
+
+    def undo(self, ws):
+        return self._step(ws, self._undo, self._redo)
+
+    def redo(self, ws):
+        return self._step(ws, self._redo, self._undo)
+
+    def _step(self, ws, from_stack, to_stack):
+        self.end(ws)
+        if not from_stack:
+            return
+        to_stack.append(snapshot(ws))
+        return restore(ws, from_stack.pop())
@@ -0,0 +1,196 @@
+import json
+import os
+
+from . import tiling
+from .core import NO_CHILDREN, Partition, iter_pre_order
+from .geometry import Split
+
+
+# saving & restoring workspaces across restarts
+# trees are stored without dims (they come back from the splits)
+# and windows as [hwnd, class, title] so they can be found again
+
+FORMAT_VERSION = 1
+
+
+# -- saving -- #
+
+def dump_workspace(ws):
+    schemes = {}
+
+    def scheme_i(ts):
+        if ts is None:
+            return -1
+        if id(ts) not in schemes:
+            schemes[id(ts)] = (len(schemes), ts)
+        return schemes[id(ts)][0]
+
+    # iterative so deep trees are fine
+    root = ws.children[0]
+    nodes = {}
+    for part in reversed(list(iter_pre_order(root))):
+        node = {'ts': scheme_i(part.assoc_ts)}
+        if part.split is not None:
+            node['s'] = list(part.split)
+        if part.window is not None:
+            win = part.window
+            node['w'] = [win.hwnd, win.class_name, win.title]
+        if part.children:
+            node['c'] = [nodes.pop(id(c)) for c in part.children]
+        nodes[id(part)] = node
+
+    return {
+        'ts': scheme_i(ws.tile_scheme),
+        'root': nodes[id(root)],
+        'cur': part_path(ws.cur_part),
+        'schemes': [dump_scheme(ts) for _, ts in sorted(schemes.values(), key=lambda st: st[0])],
+    }
+
+
+def dump_scheme(ts):
+    return {'type': type(ts).__name__, 'state': dict(vars(ts))}
+
+
+def part_path(part):
+    # child indices from the root down
+    path = []
+    while part.parent is not None and isinstance(part.parent, Partition):
+        path.append(part.index)
+        part = part.parent
+    return path[::-1]
+
+
+def dump_layout(workspaces, workspace_inds, display_ind):
+    return {
+        'version': FORMAT_VERSION,
+        'display_ind': display_ind,
+        'workspace_inds': list(workspace_inds),
+        'displays': [[dump_workspace(ws) for ws in disp_wss] for disp_wss in workspaces],
+    }
+
+
+def save(path, layout):
+    # write next to it first so a crash never leaves half a file
+    tmp_path = '{}.tmp'.format(path)
+    with open(tmp_path, 'w') as f:
+        json.dump(layout, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+# -- restoring -- #
+
+def load(path):
+    try:
+        with open(path) as f:
+            layout = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(layout, dict) or layout.get('version') != FORMAT_VERSION:
+        return
+    return layout
+
+
+def load_scheme(data):
+    cls = getattr(tiling, data.get('type', ''), None)
+    if not isinstance(cls, type) or not issubclass(cls, tiling.TileScheme):
+        return tiling.DefaultTilingScheme()
+    ts = cls.__new__(cls)
+    ts.__dict__.update(data.get('state', {}))
+    return ts
+
+
+def load_workspace(ws, data):
+    # rebuilds ws from saved data, returns [(leaf, saved window), ...] to be matched up
+    schemes = [load_scheme(d) for d in data['schemes']]
+
+    def scheme(i):
+        return schemes[i] if 0 <= i < len(schemes) else None
+
+    if data['ts'] >= 0:
+        ws.tile_scheme = ws.assoc_ts = scheme(data['ts'])
+
+    root = Partition(None, ws.base_dims, ts=scheme(data['root']['ts']))
+    to_match = []
+    stack = [(root, data['root'])]
+    while stack:
+        part, node = stack.pop()
+        if 's' in node:
+            part.split = Split(*node['s'])
+        if 'w' in node:
+            hwnd, cls, title = node['w']
+            if not isinstance(hwnd, int) or not isinstance(cls, str) or not isinstance(title, str):
+                raise ValueError('bad window: {}'.format(node['w']))
+            to_match.append((part, (hwnd, cls, title)))
+        part.children = [Partition(part, ws.base_dims, i, ts=scheme(child['ts']))
+                         for i, child in enumerate(node.get('c', []))] or NO_CHILDREN
+        stack.extend(zip(part.children, node.get('c', [])))
+
+    cur = root
+    for i in data.get('cur', []):
+        if i >= len(cur.children):
+            break
+        cur = cur.children[i]
+    if not cur.is_empty:
+        cur = next(cur.iter_leaves())
+
+    ws.set_root(root, cur)
+    return to_match
+
+
+class WindowMatcher:
+    # finds live windows for saved ones
+    # first by hwnd (if it's still the same class of window), then by class & title
+    def __init__(self, win_methods):
+        self.win_methods = win_methods
+        self.live = set(win_methods.backend.enum_windows())
+        self.taken = set()
+        self._by_name = None
+
+    def _win(self, hwnd):
+        win = self.win_methods.hwnd_to_win.get(hwnd)
+        if win is None:
+            win = self.win_methods._new_win(hwnd)
+        return win
+
+    def _by_name_lookup(self):
+        if self._by_name is None:
+            self._by_name = {}
+            for hwnd in sorted(self.live - self.taken):
+                if not self.win_methods.backend.is_visible(hwnd):
+                    continue
+                win = self._win(hwnd)
+                self._by_name.setdefault((win.class_name, win.title), []).append(hwnd)
+        return self._by_name
+
+    def _take(self, part, hwnd):
+        self.taken.add(hwnd)
+        win = self._win(hwnd)
+        if win.part is not None:
+            return
+        self.win_methods.hwnd_to_win[hwnd] = win
+        part.window = win
+        win.part = part
+        return win
+
+    def match(self, to_match):
+        # [(leaf, [hwnd, class, title]), ...] -> windows that got a spot
+        tor = []
+        left = []
+        for part, (hwnd, cls, title) in to_match:
+            if hwnd in self.live and hwnd not in self.taken and self._win(hwnd).class_name == cls:
+                win = self._take(part, hwnd)
+                if win is not None:
+                    tor.append(win)
+                    continue
+            left.append((part, (cls, title)))
+
+        for part, key in left:
+            hwnds = self._by_name_lookup().get(key, [])
+            while hwnds:
+                hwnd = hwnds.pop(0)
+                if hwnd not in self.taken:
+                    win = self._take(part, hwnd)
+                    if win is not None:
+                        tor.append(win)
+                    break
+        return tor
@@ -0,0 +1,129 @@
+import re
+
+from collections import namedtuple
+
+
+# a window matches a rule if it matches every field that's given
+# title & cls are regexes (that have to match the whole thing)
+# process is the exe name (case doesn't matter)
+# style/exstyle are bits, any of them being set is a match
+Rule = namedtuple('Rule', ['title', 'cls', 'process', 'style', 'exstyle'],
+                  defaults=[None, None, None, 0, 0])
+
+DEFAULT_RULES = [
+    Rule(title='__bbwm__'),
+    Rule(title='Cortana'),
+    Rule(title='Blackbox'),
+]
+
+
+def _fields(rule):
+    return [f for f in Rule._fields if getattr(rule, f)]
+
+
+def _alternation(patterns):
+    if not patterns:
+        return
+    return re.compile('|'.join('(?:{})'.format(p) for p in patterns))
+
+
+def _joined(rule):
+    # one rule on title/cls/process as a regex over 'title\0cls\0process'
+    anything = '[^\x00]*'
+    fields = [rule.title or anything, rule.cls or anything,
+              re.escape(rule.process.lower()) if rule.process else anything]
+    return '\x00'.join('(?:{})'.format(f) for f in fields)
+
+
+class WindowRules:
+    # rules for windows bbwm should leave alone
+    # rules on one field are merged into one check per field
+    # (a regex alternation, a set of exes, a style mask),
+    # ones on several of title/cls/process into one regex over all three
+    # & ones that also care about style bits get checked rule by rule
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+
+        single = {f: [] for f in Rule._fields}
+        joined = []
+        self._multi = []
+        for r in self.rules:
+            fields = _fields(r)
+            if len(fields) == 1:
+                single[fields[0]].append(getattr(r, fields[0]))
+            elif fields and not (r.style or r.exstyle):
+                joined.append(_joined(r))
+            elif fields:
+                self._multi.append(Rule(
+                    re.compile(r.title) if r.title else None,
+                    re.compile(r.cls) if r.cls else None,
+                    r.process.lower() if r.process else None,
+                    r.style, r.exstyle))
+
+        self._joined = _alternation(joined)
+        self._title = _alternation(single['title'])
+        self._cls = _alternation(single['cls'])
+        self._process = {p.lower() for p in single['process']}
+        self._style = 0
+        for s in single['style']:
+            self._style |= s
+        self._exstyle = 0
+        for s in single['exstyle']:
+            self._exstyle |= s
+
+        # only ask windows about things some rule cares about
+        needed = set(f for f in Rule._fields if single[f])
+        for r in self.rules:
+            if len(_fields(r)) > 1:
+                needed.update(_fields(r))
+        self._needed = needed
+
+        # hwnd -> ignored or not, until it closes or its title changes
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def ignores(self, win):
+        # win is a WinWin
+        hit = self._cache.get(win.hwnd)
+        if hit is None:
+            hit = self._cache[win.hwnd] = self._match(win)
+        return hit
+
+    def forget(self, hwnd):
+        self._cache.pop(hwnd, None)
+
+    def _match(self, win):
+        if not self._needed:
+            return False
+        title = win.title if 'title' in self._needed else None
+        cls = win.class_name if 'cls' in self._needed else None
+        process = win.process_name.lower() if 'process' in self._needed else None
+        style, exstyle = win.style if self._needed & {'style', 'exstyle'} else (0, 0)
+
+        if self._title is not None and self._title.fullmatch(title):
+            return True
+        if self._cls is not None and self._cls.fullmatch(cls):
+            return True
+        if process in self._process:
+            return True
+        if style & self._style or exstyle & self._exstyle:
+            return True
+        if self._joined is not None and self._joined.fullmatch(
+                '\x00'.join([title or '', cls or '', process or ''])):
+            return True
+
+        for r in self._multi:
+            if r.title is not None and not r.title.fullmatch(title):
+                continue
+            if r.cls is not None and not r.cls.fullmatch(cls):
+                continue
+            if r.process is not None and r.process != process:
+                continue
+            if r.style and not style & r.style:
+                continue
+            if r.exstyle and not exstyle & r.exstyle:
+                continue
+            return True
+        return False
@@ -0,0 +1,155 @@
+import threading
+import time
+
+from collections import defaultdict, deque
+
+
+# where a msg can be in its life, in order
+STAGES = ['receive', 'dispatch', 'layout', 'apply', 'draw_start', 'draw_end']
+
+
+def percentile(sorted_vals, p):
+    return sorted_vals[min(len(sorted_vals) - 1, len(sorted_vals) * p // 100)]
+
+
+class Trace:
+    # timestamps for one msg
+    def __init__(self, action, received=None):
+        self.action = action
+        if received is None:
+            received = time.perf_counter()
+        self.marks = [('receive', received)]
+        self.pending_draw = False
+
+    def mark(self, stage):
+        self.marks.append((stage, time.perf_counter()))
+
+    def reached(self, stage):
+        return any(s == stage for s, _ in self.marks)
+
+    def durations(self):
+        # time spent getting to each stage (from the one before it)
+        # and the whole thing as 'total'
+        tor = []
+        for (_, t0), (stage, t1) in zip(self.marks, self.marks[1:]):
+            tor.append((stage, t1 - t0))
+        tor.append(('total', self.marks[-1][1] - self.marks[0][1]))
+        return tor
+
+
+class Tracer:
+    # opt-in latency tracing, from receiving a msg until it's on screen
+    # keeps the last `window` samples of every stage per action
+    def __init__(self, enabled=False, window=200):
+        self.enabled = enabled
+        self.window = window
+        # the trace of the msg being handled right now (if any)
+        self.current = None
+        # msgs of this batch that have been handled but not flushed yet
+        self._batch = []
+        # msgs whose draw hasn't finished, if it gets dropped the next draw covers them
+        self._drawing = []
+        self.superseded = 0
+
+        self.action_names = {}
+        self._samples = defaultdict(lambda: defaultdict(lambda: deque(maxlen=self.window)))
+        self._lock = threading.Lock()
+
+    def name_action(self, action, name):
+        self.action_names[action] = name
+
+    def begin(self, action, received=None):
+        if not self.enabled:
+            return
+        self.current = Trace(self.action_names.get(action, action), received)
+        return self.current
+
+    def mark(self, stage):
+        # outside of a msg (flushing the batch) it counts for every msg in the batch
+        if self.current is not None:
+            self.current.mark(stage)
+        else:
+            for trace in self._batch:
+                trace.mark(stage)
+
+    def end_dispatch(self):
+        # done handling the msg, the batch it came in still has to be flushed
+        trace, self.current = self.current, None
+        if trace is not None:
+            self._batch.append(trace)
+
+    def end_batch(self):
+        # batch flushed, anything else happens when the draw comes around
+        batch, self._batch = self._batch, []
+        for trace in batch:
+            if not trace.pending_draw:
+                self.finish(trace)
+
+    def finish(self, trace):
+        with self._lock:
+            samples = self._samples[trace.action]
+            for stage, dt in trace.durations():
+                samples[stage].append(dt)
+
+    def draw_markers(self):
+        # (draw_start, draw_end) draw job steps for the msg(s) this draw is for
+        # msgs still waiting on a draw that's been dropped for this one get it too
+        traces = [self.current] if self.current is not None else list(self._batch)
+        superseded = [t for t in self._drawing if t.pending_draw and t not in traces]
+        self.superseded += len(superseded)
+        traces += superseded
+        if not traces:
+            return
+        for trace in traces:
+            trace.pending_draw = True
+        self._drawing = [t for t in self._drawing if t.pending_draw and t not in traces] + traces
+
+        def start():
+            for trace in traces:
+                # a dropped draw might've gotten that far already
+                if trace.pending_draw and not trace.reached('draw_start'):
+                    trace.mark('draw_start')
+            return True
+
+        def end():
+            for trace in traces:
+                if trace.pending_draw:
+                    trace.mark('draw_end')
+                    trace.pending_draw = False
+                    self.finish(trace)
+            self._drawing = [t for t in self._drawing if t.pending_draw]
+            return True
+
+        return start, end
+
+    def percentiles(self, action, ps=(50, 90, 99)):
+        # stage -> (count, [percentiles..], max) in seconds
+        tor = {}
+        with self._lock:
+            samples = {k: sorted(v) for k, v in self._samples[action].items()}
+        for stage, vals in samples.items():
+            if not vals:
+                continue
+            pcts = [percentile(vals, p) for p in ps]
+            tor[stage] = (len(vals), pcts, vals[-1])
+        return tor
+
+    def dump(self):
+        if not self.enabled:
+            return 'tracing is off'
+        lines = ['{:28s} {:10s} {:>5s} {:>9s} {:>9s} {:>9s} {:>9s}'.format(
+            'action', 'stage', 'n', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms')]
+        with self._lock:
+            actions = list(self._samples)
+        for action in sorted(actions, key=str):
+            pcts = self.percentiles(action)
+            for stage in STAGES[1:] + ['total']:
+                if stage not in pcts:
+                    continue
+                n, (p50, p90, p99), mx = pcts[stage]
+                lines.append('{:28s} {:10s} {:5d} {:9.2f} {:9.2f} {:9.2f} {:9.2f}'.format(
+                    str(action)[:28], stage, n, p50 * 1e3, p90 * 1e3, p99 * 1e3, mx * 1e3))
+        if self.superseded:
+            lines.append('{} msgs had their draw dropped for a later one (timed to that one)'.format(
+                self.superseded))
+        return '\n'.join(lines)
@@ -0,0 +1,397 @@
+import os
+import ctypes
+import threading
+import win32con
+import win32gui
+import win32api
+import win32process
+
+import win32com.client
+from ctypes import windll
+
+from .backend import WinBackend
+from .geometry import Dims
+
+from collections import namedtuple
+
+
+mod_lookup = {
+    "ctrl": win32con.MOD_CONTROL, "alt": win32con.MOD_ALT,
+    "win": win32con.MOD_WIN, "shift": win32con.MOD_SHIFT,
+}
+
+vk_lookup = {
+    "up": win32con.VK_UP, "down": win32con.VK_DOWN,
+    "left": win32con.VK_LEFT, "right": win32con.VK_RIGHT,
+
+    "pgup": win32con.VK_PRIOR, "pgdown": win32con.VK_NEXT,
+    "home": win32con.VK_HOME, "end": win32con.VK_END,
+    "insert": win32con.VK_INSERT, "delete": win32con.VK_DELETE,
+
+    "tab": win32con.VK_TAB, "escape": win32con.VK_ESCAPE, "backspace": win32con.VK_BACK,
+    "enter": win32con.VK_RETURN, "space": win32con.VK_SPACE,
+
+    "f1": win32con.VK_F1, "f2": win32con.VK_F2, "f3": win32con.VK_F3, "f4": win32con.VK_F4,
+    "f5": win32con.VK_F5, "f6": win32con.VK_F6, "f7": win32con.VK_F7, "f8": win32con.VK_F8,
+    "f9": win32con.VK_F9, "f10": win32con.VK_F10, "f11": win32con.VK_F11, "f12": win32con.VK_F12,
+    "f13": win32con.VK_F13, "f14": win32con.VK_F14, "f15": win32con.VK_F15, "f16": win32con.VK_F16,
+    "f17": win32con.VK_F17, "f18": win32con.VK_F18, "f19": win32con.VK_F19, "f20": win32con.VK_F20,
+    "f21": win32con.VK_F21, "f22": win32con.VK_F22, "f23": win32con.VK_F23, "f24": win32con.VK_F24
+}
+
+
+class KeyBind(namedtuple('KeyBind', ['id', 'mods', 'virt_keys'])):
+    __slots__ = ()
+
+    @classmethod
+    def from_combo(cls, hk_id, key_combo):
+        mods = 0
+        vk = 0
+        split_keys = key_combo.split('+')
+
+        for k in split_keys:
+            if k in mod_lookup:
+                mods += mod_lookup[k]
+            elif k in vk_lookup:
+                vk = vk_lookup[k]
+            else:
+                vk = ord(k.upper())
+
+        return cls(hk_id, mods, vk)
+
+    def register(self, hwnd):
+        return windll.user32.RegisterHotKey(hwnd, self.id, self.mods, self.virt_keys)
+
+    def unregister(self, hwnd):
+        windll.user32.UnregisterHotKey(hwnd, self.id)
+
+
+class Win32Backend(WinBackend):
+    # the real deal (pywin32)
+    DEFER_FLAGS = win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE | win32con.SWP_SHOWWINDOW
+    SHOW_FLAGS = win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE | win32con.SWP_SHOWWINDOW
+    HIDE_FLAGS = win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE | \
+        win32con.SWP_NOZORDER | win32con.SWP_HIDEWINDOW
+
+    def __init__(self):
+        self.shell = win32com.client.Dispatch("WScript.Shell")
+        self.spy = None
+        self.hotkeys = []
+        # hotkeys & the spy window belong to whichever thread set them up
+        self._listen_thread = None
+
+        self.msg_type_to_action = {
+            win32con.HSHELL_WINDOWCREATED: 'new_win',
+            win32con.HSHELL_WINDOWDESTROYED: 'close_win',
+            32772: 'focus_win',
+            win32con.HSHELL_REDRAW: 'title_change',
+            # no shell msg for windows moving around (GETMINRECT doesn't come w/ a hwnd)
+            # so their rects just time out
+        }
+
+    # -- displays -- #
+
+    def monitors(self):
+        enumed_displays = win32api.EnumDisplayMonitors()
+        tor = []
+        for handle, _, rect in enumed_displays:
+            left_x, top_y, right_x, bot_y = rect
+            tor.append((handle, Dims(left_x, top_y, right_x - left_x, bot_y - top_y)))
+        return tor
+
+    def monitor_from_window(self, hwnd):
+        try:
+            return win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONEAREST)
+        except:
+            pass
+
+    # -- windows -- #
+
+    def enum_windows(self):
+        def callback(handle, tor):
+            tor.append(handle)
+            return True
+
+        windows = []
+        win32gui.EnumWindows(callback, windows)
+        return windows
+
+    def get_title(self, hwnd):
+        try:
+            return win32gui.GetWindowText(hwnd)
+        except:
+            return ''
+
+    def get_class_name(self, hwnd):
+        try:
+            return win32gui.GetClassName(hwnd)
+        except:
+            return ''
+
+    def get_process_name(self, hwnd):
+        try:
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            # limited info works on elevated processes too
+            handle = windll.kernel32.OpenProcess(0x1000, False, pid)
+            if not handle:
+                return ''
+            try:
+                buf_len = ctypes.c_ulong(260)
+                buf = ctypes.create_unicode_buffer(buf_len.value)
+                if windll.kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(buf_len)):
+                    return os.path.basename(buf.value)
+            finally:
+                windll.kernel32.CloseHandle(handle)
+        except:
+            pass
+        return ''
+
+    def get_style(self, hwnd):
+        try:
+            return (win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE),
+                    win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE))
+        except:
+            return 0, 0
+
+    def get_rect(self, hwnd):
+        try:
+            l, t, r, b = win32gui.GetWindowRect(hwnd)
+            return Dims(l, t, r - l, b - t)
+        except:
+            pass
+
+    def move(self, hwnd, dims):
+        try:
+            # show it if it is hidden..
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            win32gui.MoveWindow(hwnd, *dims, True)
+            return True
+        except:
+            return False
+
+    def begin_defer(self, n):
+        return win32gui.BeginDeferWindowPos(n)
+
+    def defer(self, handle, hwnd, dims):
+        # deferred positioning can't un-minimize/maximize
+        if win32gui.IsIconic(hwnd) or win32gui.IsZoomed(hwnd):
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        return win32gui.DeferWindowPos(handle, hwnd, 0, *dims, self.DEFER_FLAGS)
+
+    def defer_visibility(self, handle, hwnd, visible):
+        if visible:
+            # shown windows come up on top
+            return win32gui.DeferWindowPos(handle, hwnd, win32con.HWND_TOP, 0, 0, 0, 0, self.SHOW_FLAGS)
+        return win32gui.DeferWindowPos(handle, hwnd, 0, 0, 0, 0, 0, self.HIDE_FLAGS)
+
+    def end_defer(self, handle):
+        win32gui.EndDeferWindowPos(handle)
+
+    def is_decorated(self, hwnd):
+        try:
+            if win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE) & win32con.WS_CAPTION:
+                return True
+            else:
+                return False
+        except:
+            pass
+
+    def set_decorated(self, hwnd, decorated):
+        try:
+            style = win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE)
+            if decorated:
+                style |= win32con.WS_CAPTION
+            else:
+                style &= ~win32con.WS_CAPTION
+            win32gui.SetWindowLong(hwnd, win32con.GWL_STYLE, style)
+            win32gui.SetWindowPos(hwnd, 0, 0, 0, 0, 0,
+                                  win32con.SWP_FRAMECHANGED +
+                                  win32con.SWP_NOMOVE +
+                                  win32con.SWP_NOSIZE +
+                                  win32con.SWP_NOZORDER)
+        except:
+            pass
+
+    def is_visible(self, hwnd):
+        try:
+            return bool(win32gui.IsWindowVisible(hwnd))
+        except:
+            return False
+
+    def show_normal(self, hwnd):
+        try:
+            return win32gui.ShowWindow(hwnd, win32con.SW_SHOWNORMAL)
+        except:
+            pass
+
+    def hide(self, hwnd):
+        try:
+            win32gui.ShowWindow(hwnd, win32con.SW_HIDE)
+        except:
+            pass
+
+    def bring_to_top(self, hwnd):
+        try:
+            win32gui.BringWindowToTop(hwnd)
+        except:
+            pass
+
+    def set_topmost(self, hwnd):
+        exstyle = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+        exstyle |= win32con.WS_EX_TOPMOST
+        win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, exstyle)
+
+    # -- focus & mouse -- #
+
+    def foreground_window(self):
+        try:
+            return win32gui.GetForegroundWindow()
+        except win32gui.error:
+            pass
+
+    def focus(self, hwnd):
+        try:
+            # need to do stupid thing..
+            # see remarks from here: https://msdn.microsoft.com/en-us/library/windows/desktop/ms633539(v=vs.85).aspx
+            self.shell.SendKeys('+')
+            win32gui.SetForegroundWindow(hwnd)
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            return True
+        except:
+            pass
+
+    def window_from_point(self, point):
+        try:
+            return win32gui.WindowFromPoint(point)
+        except win32gui.error:
+            pass
+
+    def cursor_pos(self):
+        try:
+            return win32api.GetCursorPos()
+        except win32api.error:
+            pass
+
+    def set_cursor_pos(self, point):
+        try:
+            win32api.SetCursorPos(point)
+            return True
+        except:
+            pass
+
+    # -- events -- #
+
+    def start_listening(self, hotkeys):
+        self._listen_thread = threading.get_ident()
+        self.spy = WinTaskIcon()
+        self.hotkeys = [KeyBind.from_combo(hk_id, combo) for hk_id, combo in hotkeys]
+        for hk in self.hotkeys:
+            hk.register(self.spy.hwnd)
+
+    def stop_listening(self):
+        if self.spy is None:
+            return
+        if threading.get_ident() != self._listen_thread:
+            # only works from the thread that registered them, so ask it to
+            win32gui.PostMessage(self.spy.hwnd, WinTaskIcon.STOP_LISTENING, 0, 0)
+            return
+        self._stop_listening()
+
+    def _stop_listening(self):
+        spy, self.spy = self.spy, None
+        for hk in self.hotkeys:
+            hk.unregister(spy.hwnd)
+        spy.destroy()
+
+    def next_msg(self, block=True):
+        # GetMessage is blocking no matter what
+        msg = self.spy.get_msg()
+        while msg:
+            lparam = msg[1][2]
+            hwnd = msg[1][3]
+            # point = msg[1][5]
+            if msg[1][1] == win32con.WM_HOTKEY:
+                return lparam, hwnd
+            elif msg[1][1] == WinTaskIcon.DISPLAY_CHANGED:
+                return 'display_change', 0
+            elif msg[1][1] == WinTaskIcon.STOP_LISTENING:
+                # posted by stop_listening, nothing else is coming after this
+                self._stop_listening()
+                return
+            elif lparam in self.msg_type_to_action:
+                return self.msg_type_to_action[lparam], hwnd
+            msg = self.spy.get_msg()
+
+
+class WinTaskIcon:
+    # inspo: https://github.com/tzbob/python-windows-tiler/blob/master/pwt/notifyicon.py
+    DISPLAY_CHANGED = win32con.WM_USER + 21
+    STOP_LISTENING = win32con.WM_USER + 22
+
+    def __init__(self):
+        window_class_name = "bbwm icon"
+        # Register the Window class.
+        window_class = win32gui.WNDCLASS()
+        window_class.hInstance = win32gui.GetModuleHandle(None)
+        window_class.lpszClassName = window_class_name
+        window_class.style = win32con.CS_VREDRAW | win32con.CS_HREDRAW
+        window_class.hCursor = win32gui.LoadCursor(0, win32con.IDC_ARROW)
+        window_class.hbrBackground = win32con.COLOR_WINDOW
+        window_class.lpfnWndProc = {win32con.WM_DISPLAYCHANGE: self.on_display_change}
+        reg_win_class = win32gui.RegisterClass(window_class)
+
+        # create window
+        self.hwnd = win32gui.CreateWindow(reg_win_class, window_class_name,
+                                          win32con.WS_OVERLAPPED | win32con.WS_SYSMENU,  # style
+                                          0, 0, win32con.CW_USEDEFAULT, win32con.CW_USEDEFAULT, 0, 0,
+                                          window_class.hInstance, None)
+
+        win32gui.UpdateWindow(self.hwnd)
+
+        # draw icon
+        file_path = os.path.dirname(os.path.realpath(__file__))
+        icon_path = os.path.join(file_path, 'icon.ico')
+        if os.path.exists(icon_path):
+            self.icon = win32gui.LoadImage(win32gui.GetModuleHandle(None),
+                                           icon_path,
+                                           win32con.IMAGE_ICON,
+                                           0, 0, win32con.LR_LOADFROMFILE | win32con.LR_DEFAULTSIZE)
+        else:
+            # hold onto this in order to show balloons
+            self.icon = win32gui.LoadIcon(0, win32con.IDI_APPLICATION)
+
+        notify_id = (self.hwnd, 0,
+                     win32gui.NIF_ICON | win32gui.NIF_MESSAGE | win32gui.NIF_TIP,
+                     win32con.WM_USER + 20, self.icon,
+                     "bbwm")  # hovertext
+
+        win32gui.Shell_NotifyIcon(win32gui.NIM_ADD, notify_id)
+        self.register_shellhook()
+
+    def destroy(self):
+        self.unregister_shellhook()
+        try:
+            # doesn't play nice if blackbox is running.. lol
+            win32gui.Shell_NotifyIcon(win32gui.NIM_DELETE, (self.hwnd, 0))
+        except:
+            pass
+
+    def on_display_change(self, hwnd, msg, wparam, lparam):
+        # this one gets sent not posted so GetMessage never sees it, repost it
+        win32gui.PostMessage(hwnd, self.DISPLAY_CHANGED, 0, 0)
+        return 0
+
+    def register_shellhook(self):
+        if windll.user32.RegisterShellHookWindow(self.hwnd):
+            return True
+        return False
+
+    def unregister_shellhook(self):
+        windll.user32.DeregisterShellHookWindow(self.hwnd)
+
+    def get_msg(self):
+        # this is blocking!!
+        try:
+            return win32gui.GetMessage(self.hwnd, 0, 0)
+        except Exception as e:
+            print(e)
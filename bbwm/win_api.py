@@ -1,26 +1,34 @@
-import os
 import threading
-import win32con
-import win32gui
-import win32api
-
-import win32com.client
-from ctypes import windll
+import time
 
 from .core import Dims
+from .batch import MoveBatch
+from .rules import WindowRules, DEFAULT_RULES
+from .events import EventQueue, coalesce, SHELL_ACTIONS
+from .trace import Tracer
 
-from collections import namedtuple
+from collections import Counter
 
 
-# regex for custom stuff
-BANNED_WINDOW_TITLES = ['__bbwm__', 'Cortana', 'Blackbox']
+# style bits of windows that are never worth tiling
+WS_CHILD = 0x40000000
+WS_MINIMIZE = 0x20000000
+WS_EX_TOOLWINDOW = 0x00000080
+WS_EX_NOACTIVATE = 0x08000000
 
 
 class WinWin:
-    def __init__(self, handle, shell):
+    __slots__ = ('hwnd', 'part', 'backend', '_applied_dims', 'info_ttl', '_info')
+
+    def __init__(self, handle, backend, info_ttl=5.0):
         self.hwnd = handle
         self.part = None
-        self.shell = shell
+        self.backend = backend
+        # where we last put it
+        self._applied_dims = None
+        # title/rect/style, each is (when we asked, value)
+        self.info_ttl = info_ttl
+        self._info = {}
 
     def __str__(self):
         str_repr = 'win: {}'.format(self.hwnd)
@@ -28,205 +36,237 @@ class WinWin:
             str_repr = '{}\tpart: {}'.format(str_repr, self.part)
         return str_repr
 
+    def _cached(self, key, fetch):
+        now = time.monotonic()
+        hit = self._info.get(key)
+        if hit is not None and now - hit[0] < self.info_ttl:
+            return hit[1]
+        val = fetch(self.hwnd)
+        self._info[key] = (now, val)
+        return val
+
+    def forget_info(self, *keys):
+        # everything if no keys
+        if not keys:
+            self._info.clear()
+        for k in keys:
+            self._info.pop(k, None)
+
+    @property
+    def applied_dims(self):
+        return self._applied_dims
+
+    @applied_dims.setter
+    def applied_dims(self, new_dims):
+        # it won't necessarily end up exactly there
+        self._applied_dims = new_dims
+        self.forget_info('rect')
+
     @property
     def dims(self):
-        try:
-            l, t, r, b = win32gui.GetWindowRect(self.hwnd)
-            return Dims(l, t, r - l, b - t)
-        except:
+        dims = self._cached('rect', self.backend.get_rect)
+        if dims is None:
             return Dims(-1, -1, -1, -1)
+        return dims
 
     def set_dims(self, new_dims):
-        try:
-            # show it if it is hidden..
-            win32gui.ShowWindow(self.hwnd, win32con.SW_RESTORE)
-            win32gui.MoveWindow(self.hwnd, *new_dims, True)
-        except:
+        if self.backend.move(self.hwnd, new_dims) is False:
             return False
+        self.applied_dims = new_dims
 
     @property
     def is_decorated(self):
-        try:
-            if win32gui.GetWindowLong(self.hwnd, win32con.GWL_STYLE) & win32con.WS_CAPTION:
-                return True
-            else:
-                return False
-        except:
-            pass
+        return self._cached('decorated', self.backend.is_decorated)
 
     def undecorate(self):
         # undecorate window (only do this once)
         if self.is_decorated:
-            style = win32gui.GetWindowLong(self.hwnd, win32con.GWL_STYLE)
-            style -= win32con.WS_CAPTION
-            win32gui.SetWindowLong(self.hwnd, win32con.GWL_STYLE, style)
+            self.backend.set_decorated(self.hwnd, False)
+            self.forget_info('decorated', 'rect')
 
     def redecorate(self):
         # make it how it was
         if not self.is_decorated:
-            style = win32gui.GetWindowLong(self.hwnd, win32con.GWL_STYLE)
-            style += win32con.WS_CAPTION
-            try:
-                win32gui.SetWindowLong(self.hwnd, win32con.GWL_STYLE, style)
-                win32gui.SetWindowPos(self.hwnd, 0, 0, 0, 0, 0,
-                                      win32con.SWP_FRAMECHANGED +
-                                      win32con.SWP_NOMOVE +
-                                      win32con.SWP_NOSIZE +
-                                      win32con.SWP_NOZORDER)
-            except:
-                pass
+            self.backend.set_decorated(self.hwnd, True)
+            self.forget_info('decorated', 'rect')
 
     @property
     def is_visible(self):
-        try:
-            return win32gui.ShowWindow(self.hwnd, win32con.SW_SHOWNORMAL)
-        except:
-            pass
+        return self.backend.is_visible(self.hwnd)
 
     def hide(self):
         if self.is_visible:
-            win32gui.ShowWindow(self.hwnd, win32con.SW_HIDE)
+            self.backend.hide(self.hwnd)
 
     def unhide(self):
         if not self.is_visible:
-            win32gui.ShowWindow(self.hwnd, win32con.SW_SHOWNORMAL)
-            win32gui.BringWindowToTop(self.hwnd)
+            self.backend.show_normal(self.hwnd)
+            self.backend.bring_to_top(self.hwnd)
 
     @property
     def is_focused(self):
-        try:
-            return self.hwnd == win32gui.GetForegroundWindow()
-        except win32gui.error:
-            pass
+        return self.hwnd == self.backend.foreground_window()
 
     def focus(self, also_center=False):
-        try:
-            # need to do stupid thing..
-            # see remarks from here: https://msdn.microsoft.com/en-us/library/windows/desktop/ms633539(v=vs.85).aspx
-            self.shell.SendKeys('+')
-            win32gui.SetForegroundWindow(self.hwnd)
-            win32gui.ShowWindow(self.hwnd, win32con.SW_RESTORE)
+        if self.backend.focus(self.hwnd):
             if also_center:
                 return self.center_on_me()
             return True
-        except:
-            pass
 
     def center_on_me(self):
-        try:
-            d = self.dims
-            win32api.SetCursorPos((d.midpoint()))
-            return True
-        except:
-            pass
+        return self.backend.set_cursor_pos(self.dims.midpoint())
 
     @property
     def title(self):
-        try:
-            return win32gui.GetWindowText(self.hwnd)
-        except:
-            return ''
-
-
-mod_lookup = {
-    "ctrl": win32con.MOD_CONTROL, "alt": win32con.MOD_ALT,
-    "win": win32con.MOD_WIN, "shift": win32con.MOD_SHIFT,
-}
+        return self._cached('title', self.backend.get_title)
 
-vk_lookup = {
-    "up": win32con.VK_UP, "down": win32con.VK_DOWN,
-    "left": win32con.VK_LEFT, "right": win32con.VK_RIGHT,
-
-    "pgup": win32con.VK_PRIOR, "pgdown": win32con.VK_NEXT,
-    "home": win32con.VK_HOME, "end": win32con.VK_END,
-    "insert": win32con.VK_INSERT, "delete": win32con.VK_DELETE,
-
-    "tab": win32con.VK_TAB, "escape": win32con.VK_ESCAPE, "backspace": win32con.VK_BACK,
-    "enter": win32con.VK_RETURN, "space": win32con.VK_SPACE,
-
-    "f1": win32con.VK_F1, "f2": win32con.VK_F2, "f3": win32con.VK_F3, "f4": win32con.VK_F4,
-    "f5": win32con.VK_F5, "f6": win32con.VK_F6, "f7": win32con.VK_F7, "f8": win32con.VK_F8,
-    "f9": win32con.VK_F9, "f10": win32con.VK_F10, "f11": win32con.VK_F11, "f12": win32con.VK_F12,
-    "f13": win32con.VK_F13, "f14": win32con.VK_F14, "f15": win32con.VK_F15, "f16": win32con.VK_F16,
-    "f17": win32con.VK_F17, "f18": win32con.VK_F18, "f19": win32con.VK_F19, "f20": win32con.VK_F20,
-    "f21": win32con.VK_F21, "f22": win32con.VK_F22, "f23": win32con.VK_F23, "f24": win32con.VK_F24
-}
-
-
-class KeyBind(namedtuple('KeyBind', ['id', 'mods', 'virt_keys'])):
-    __slots__ = ()
+    @property
+    def class_name(self):
+        return self._cached('class', self.backend.get_class_name)
 
-    def register(self, hwnd):
-        return windll.user32.RegisterHotKey(hwnd, self.id, self.mods, self.virt_keys)
+    @property
+    def process_name(self):
+        return self._cached('process', self.backend.get_process_name)
 
-    def unregister(self, hwnd):
-        windll.user32.UnregisterHotKey(hwnd, self.id)
+    @property
+    def style(self):
+        # (style, extended style)
+        return self._cached('style', self.backend.get_style)
 
 
 class WinMethods:
-    def __init__(self, msg_processor=None):
+    def __init__(self, msg_processor=None, backend=None, queue_size=256, info_ttl=5.0, rules=None):
+        if backend is None:
+            # only import pywin32 when we're actually on windows
+            from .win32_backend import Win32Backend
+            backend = Win32Backend()
+        self.backend = backend
+
         self.monitors = []
+        # monitor handle -> index & hwnd -> (where we put it, monitor index)
+        self._monitor_index = {}
+        self._hwnd_monitor = {}
         self.find_monitors()
 
+        self.move_stats = Counter()
+        # how long (s) to trust window titles/rects/styles between events about them
+        self.info_ttl = info_ttl
+        # windows to leave alone
+        self.rules = WindowRules(DEFAULT_RULES if rules is None else rules)
+
         self.hwnd_to_win = {0: None}
+        # windows we hid (how many times), hiding sends the same msg as closing
+        self._hidden_by_us = Counter()
 
         if msg_processor is None:
             def msg_processor(m):
                 pass
 
         self.msg_processor = msg_processor
-        self.spy = None
+        # called once every batch of msgs has been handled
+        self.batch_processor = None
         self.hotkeys = []
+        self.msg_thread = None
+        # set once the backend's listening (from the msg thread)
+        self._listening = threading.Event()
 
-        self.msg_type_to_action = {
-            win32con.HSHELL_WINDOWCREATED: 'new_win',
-            win32con.HSHELL_WINDOWDESTROYED: 'close_win',
-            win32con.WM_HOTKEY: 'hotkey',
-            32772: 'focus_win',
-        }
-
-        self.shell = win32com.client.Dispatch("WScript.Shell")
-
-    def _dim_from_monitor(self, rect):
-        left_x, top_y, right_x, bot_y = rect
-        return Dims(left_x, top_y, right_x - left_x, bot_y - top_y)
+        # msgs wait here until handle_events is called (from the gui thread)
+        self.events = EventQueue(queue_size)
+        self.tracer = Tracer()
 
     def find_monitors(self):
-        enumed_displays = win32api.EnumDisplayMonitors()
-        self.monitors = [(handle, self._dim_from_monitor(rect)) for
-                         handle, _, rect in enumed_displays]
+        self.monitors = self.backend.monitors()
+        self._monitor_index = {m[0]: i for i, m in enumerate(self.monitors)}
+        self._hwnd_monitor = {}
 
         xs, ys = [], []
-        for _, _, r in enumed_displays:
-            xs.extend([r[0], r[2]])
-            ys.extend([r[1], r[3]])
+        for _, d in self.monitors:
+            xs.extend([d.x, d.r_x])
+            ys.extend([d.y, d.b_y])
         self.monitor_bbox = [min(xs), min(ys), max(xs), max(ys)]
 
     def monitor_from_hwnd(self, hwnd):
-        try:
-            handle = win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONEAREST)
-        except:
+        # windows we've put somewhere don't need asking
+        win = self.hwnd_to_win.get(hwnd)
+        if win is not None and win.applied_dims is not None:
+            cached = self._hwnd_monitor.get(hwnd)
+            if cached is not None and cached[0] == win.applied_dims:
+                return cached[1]
+            monitor_i = self.monitor_from_dims(win.applied_dims)
+            self._hwnd_monitor[hwnd] = (win.applied_dims, monitor_i)
+            return monitor_i
+
+        handle = self.backend.monitor_from_window(hwnd)
+        if handle is None:
+            return -1
+        return self._monitor_index.get(handle, -1)
+
+    def monitor_from_dims(self, dims):
+        # whichever display has the midpoint (or is closest to it)
+        if not self.monitors:
             return -1
-        for i, m in enumerate(self.monitors):
-            if handle == m[0]:
+        x, y = dims.midpoint()
+        for i, (_, d) in enumerate(self.monitors):
+            if d.x <= x < d.r_x and d.y <= y < d.b_y:
                 return i
-        return -1
+        return min(range(len(self.monitors)), key=lambda i: self.monitors[i][1].distance_to(x, y))
 
-    def get_all_windows(self):
-        def callback(handle, tor):
-            tor.append(WinWin(handle, self.shell))
+    def revive_win(self, win):
+        # take back a window we forgot about (e.g. undoing an untile)
+        # unless it's gone or we've got another one for it now
+        cur = self.hwnd_to_win.get(win.hwnd)
+        if cur is win:
             return True
+        if cur is not None and cur.part is not None:
+            return False
+        if self.backend.get_rect(win.hwnd) is None:
+            return False
+        self.hwnd_to_win[win.hwnd] = win
+        # it's been wherever since we let go of it
+        win.applied_dims = None
+        return True
+
+    def forget_win(self, hwnd):
+        win = self.hwnd_to_win.pop(hwnd, None)
+        if win is not None:
+            # so it gets moved for sure if it's ever taken back
+            win.applied_dims = None
+        self.rules.forget(hwnd)
+        self._hwnd_monitor.pop(hwnd, None)
+        self._hidden_by_us.pop(hwnd, None)
+
+    def begin_moves(self):
+        # add window moves (and hides/shows) to this & commit them all at once
+        return MoveBatch(self.backend, self.move_stats, self._hidden_by_us)
+
+    def _new_win(self, hwnd):
+        return WinWin(hwnd, self.backend, self.info_ttl)
 
-        windows = []
-        win32gui.EnumWindows(callback, windows)
-
-        return windows
+    def get_all_windows(self):
+        return [self._new_win(hwnd) for hwnd in self.backend.enum_windows()]
+
+    def scan_windows(self):
+        # every open window that could be tiled (and isn't tracked yet), in one pass
+        # cheapest checks first so most hwnds never get a WinWin
+        tor = []
+        for hwnd in self.backend.enum_windows():
+            if hwnd in self.hwnd_to_win or not self.backend.is_visible(hwnd):
+                continue
+            win = self._new_win(hwnd)
+            style, exstyle = win.style
+            if style & (WS_CHILD | WS_MINIMIZE) or exstyle & (WS_EX_TOOLWINDOW | WS_EX_NOACTIVATE):
+                continue
+            if not win.title or self.rules.ignores(win):
+                continue
+            self.hwnd_to_win[hwnd] = win
+            tor.append(win)
+        return tor
 
     def _get_or_add_win(self, hwnd, add_it=True):
         if hwnd not in self.hwnd_to_win:
             if add_it:
-                new_win = WinWin(hwnd, self.shell)
-                if new_win.title in BANNED_WINDOW_TITLES:
+                new_win = self._new_win(hwnd)
+                if self.rules.ignores(new_win):
                     return
                 self.hwnd_to_win[hwnd] = new_win
             else:
@@ -234,159 +274,148 @@ class WinMethods:
         return self.hwnd_to_win[hwnd]
 
     def get_focused_window(self, only_existing=False):
-        try:
-            hwnd = win32gui.GetForegroundWindow()
+        hwnd = self.backend.foreground_window()
+        if hwnd is not None:
             return self._get_or_add_win(hwnd, not only_existing)
-        except win32gui.error:
-            pass
 
     def get_mouse_window(self, only_existing=False):
         # returns window under mouse
-        try:
-            hwnd = win32gui.WindowFromPoint(win32api.GetCursorPos())
+        pos = self.backend.cursor_pos()
+        if pos is None:
+            return
+        hwnd = self.backend.window_from_point(pos)
+        if hwnd is not None:
             return self._get_or_add_win(hwnd, not only_existing)
-        except win32gui.error:
-            pass
-        except win32api.error:
-            pass
 
     def set_mouse_pos(self, dims):
-        try:
-            win32api.SetCursorPos((dims.midpoint()))
-        except:
-            pass
+        self.backend.set_cursor_pos(dims.midpoint())
 
     def add_hotkey(self, key_combo):
         hk_id = len(self.hotkeys) + 1
-
-        mods = 0
-        vk = 0
-        split_keys = key_combo.split('+')
-
-        for k in split_keys:
-            if k in mod_lookup:
-                mods += mod_lookup[k]
-            elif k in vk_lookup:
-                vk = vk_lookup[k]
-            else:
-                vk = ord(k.upper())
-
-        self.hotkeys.append(KeyBind(hk_id, mods, vk))
+        self.hotkeys.append((hk_id, key_combo))
         return hk_id
 
-    def unbind_hotkeys(self):
-        spy_hwnd = self.spy.hwnd
-        for hk in self.hotkeys:
-            hk.unregister(spy_hwnd)
-
     def _intercept_msgs(self):
-        self.spy = WinTaskIcon()
-        spy_hwnd = self.spy.hwnd
-
-        for hk in self.hotkeys:
-            hk.register(spy_hwnd)
-
-        msg = self.spy.get_msg()
-        while msg:
-            # process msg
-            pass_it_on = True
-
-            lparam = msg[1][2]
-            hwnd = msg[1][3]
-            # point = msg[1][5]
-            if msg[1][1] == win32con.WM_HOTKEY:
-                action_hint = lparam
-            elif lparam in self.msg_type_to_action:
-                action_hint = self.msg_type_to_action[lparam]
-            else:
-                pass_it_on = False
-            if pass_it_on:
-                monitor_i = self.monitor_from_hwnd(hwnd)
-                self._handle_msg((action_hint, hwnd, monitor_i))
-            msg = self.spy.get_msg()
+        # msg thread, only queues msgs up
+        self.backend.start_listening(self.hotkeys)
+        self._listening.set()
+        msg = self.backend.next_msg(True)
+        while msg is not None:
+            self.events.put(msg)
+            msg = self.backend.next_msg(True)
+
+    def pump_msgs(self, block=False):
+        # headless version of the msg thread + handle_events
+        # (blocking keeps going until the backend runs out of msgs)
+        msg = self.backend.next_msg(block)
+        while msg is not None:
+            if not self.events.put(msg, block=False):
+                self.handle_events()
+                self.events.put(msg)
+            msg = self.backend.next_msg(block)
+        self.handle_events()
+
+    def handle_events(self):
+        # handle everything that's been queued up so far as one batch
+        # only call this from one thread (the one that owns the gui)
+        batch = []
+        event = self.events.get()
+        while event is not None:
+            batch.append(event)
+            event = self.events.get()
+        if not batch:
+            return
+
+        # before coalescing, that'd fold several of them into one
+        batch = self._drop_our_hides(batch)
+        # the hwnd might be somebody else by the next msg about it
+        for (action, hwnd), _ in batch:
+            if action in ('close_win', 'title_change'):
+                self.rules.forget(hwnd)
+        kept = coalesce(batch, self.hwnd_to_win)
+        self.events.stats['coalesced'] += len(batch) - len(kept)
+        for (action_hint, hwnd), received in kept:
+            self.tracer.begin(action_hint, received)
+            # hotkeys don't come with a window
+            monitor_i = self.monitor_from_hwnd(hwnd) if action_hint in SHELL_ACTIONS else -1
+            self._handle_msg((action_hint, hwnd, monitor_i))
+            self.tracer.end_dispatch()
+
+        if self.batch_processor is not None:
+            self.batch_processor()
+        # so the batch's traces include flushing it
+        self.tracer.end_batch()
+
+    def _drop_our_hides(self, batch):
+        # windows we hid aren't actually closed, there's one msg per time we hid it
+        hidden = self._hidden_by_us
+        if not hidden:
+            return batch
+        tor = []
+        for event in batch:
+            action, hwnd = event[0]
+            if action == 'close_win' and hidden[hwnd] > 0:
+                hidden[hwnd] -= 1
+                if not hidden[hwnd]:
+                    del hidden[hwnd]
+                continue
+            tor.append(event)
+        return tor
 
     def _handle_msg(self, msg):
         msg_type, hwnd = msg[0], msg[1]
+        if msg_type == 'display_change':
+            # indices might mean something else now, forget everything
+            self.find_monitors()
+            self.msg_processor(msg)
+            return
+        if msg_type in ['title_change', 'win_moved']:
+            win = self.hwnd_to_win.get(hwnd)
+            if win is not None:
+                win.forget_info(*(['title'] if msg_type == 'title_change' else ['rect', 'decorated']))
+                if msg_type == 'win_moved':
+                    # it's not where we put it anymore
+                    win.applied_dims = None
+            return
         if msg_type == 'new_win':
             if hwnd not in self.hwnd_to_win:
-                self.hwnd_to_win[hwnd] = WinWin(hwnd, self.shell)
+                if self._get_or_add_win(hwnd) is None:
+                    return
             else:
                 return
         elif msg_type in ['close_win', 'focus_win']:
             if hwnd not in self.hwnd_to_win:
                 return
+            if msg_type == 'focus_win':
+                self._check_moved(self.hwnd_to_win[hwnd])
         self.msg_processor(msg)
 
+    def _check_moved(self, win):
+        # windows doesn't tell us about windows being dragged/minimized/maximized
+        # so see if it's still where we put it when it gets focus
+        # if not it gets moved back the next time its workspace is laid out
+        if win is None or win.applied_dims is None:
+            return
+        win.forget_info('rect')
+        if win.dims != win.applied_dims:
+            win.applied_dims = None
+
     def set_topmost(self, hwnd):
-        exstyle = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
-        exstyle |= win32con.WS_EX_TOPMOST
-        win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, exstyle)
+        self.backend.set_topmost(hwnd)
 
-    def start_monitoring(self):
+    def start_monitoring(self, timeout=1.0):
+        # returns once msgs are coming in, so nothing we do from here on goes unheard
         self.msg_thread = threading.Thread(target=self._intercept_msgs, daemon=True)
         self.msg_thread.start()
-
-
-class WinTaskIcon:
-    # inspo: https://github.com/tzbob/python-windows-tiler/blob/master/pwt/notifyicon.py
-    def __init__(self):
-        window_class_name = "bbwm icon"
-        # Register the Window class.
-        window_class = win32gui.WNDCLASS()
-        window_class.hInstance = win32gui.GetModuleHandle(None)
-        window_class.lpszClassName = window_class_name
-        window_class.style = win32con.CS_VREDRAW | win32con.CS_HREDRAW
-        window_class.hCursor = win32gui.LoadCursor(0, win32con.IDC_ARROW)
-        window_class.hbrBackground = win32con.COLOR_WINDOW
-        reg_win_class = win32gui.RegisterClass(window_class)
-
-        # create window
-        self.hwnd = win32gui.CreateWindow(reg_win_class, window_class_name,
-                                          win32con.WS_OVERLAPPED | win32con.WS_SYSMENU,  # style
-                                          0, 0, win32con.CW_USEDEFAULT, win32con.CW_USEDEFAULT, 0, 0,
-                                          window_class.hInstance, None)
-
-        win32gui.UpdateWindow(self.hwnd)
-
-        # draw icon
-        file_path = os.path.dirname(os.path.realpath(__file__))
-        icon_path = os.path.join(file_path, 'icon.ico')
-        if os.path.exists(icon_path):
-            self.icon = win32gui.LoadImage(win32gui.GetModuleHandle(None),
-                                           icon_path,
-                                           win32con.IMAGE_ICON,
-                                           0, 0, win32con.LR_LOADFROMFILE | win32con.LR_DEFAULTSIZE)
-        else:
-            # hold onto this in order to show balloons
-            self.icon = win32gui.LoadIcon(0, win32con.IDI_APPLICATION)
-
-        notify_id = (self.hwnd, 0,
-                     win32gui.NIF_ICON | win32gui.NIF_MESSAGE | win32gui.NIF_TIP,
-                     win32con.WM_USER + 20, self.icon,
-                     "bbwm")  # hovertext
-
-        win32gui.Shell_NotifyIcon(win32gui.NIM_ADD, notify_id)
-        self.register_shellhook()
-
-    def destroy(self):
-        self.unregister_shellhook()
-        try:
-            # doesn't play nice if blackbox is running.. lol
-            win32gui.Shell_NotifyIcon(win32gui.NIM_DELETE, (self.hwnd, 0))
-        except:
-            pass
-
-    def register_shellhook(self):
-        if windll.user32.RegisterShellHookWindow(self.hwnd):
-            return True
-        return False
-
-    def unregister_shellhook(self):
-        windll.user32.DeregisterShellHookWindow(self.hwnd)
-
-    def get_msg(self):
-        # this is blocking!!
-        try:
-            return win32gui.GetMessage(self.hwnd, 0, 0)
-        except Exception as e:
-            print(e)
+        self._listening.wait(timeout)
+
+    def start_headless(self):
+        # no msg thread, call pump_msgs to process whatever happened
+        self.backend.start_listening(self.hotkeys)
+
+    def stop_monitoring(self, timeout=1.0):
+        # the msg thread cleans up after itself (hotkeys etc. are its own)
+        # give it a chance to before the process goes away
+        self.backend.stop_listening()
+        if self.msg_thread is not None and self.msg_thread is not threading.current_thread():
+            self.msg_thread.join(timeout)
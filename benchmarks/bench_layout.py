@@ -0,0 +1,302 @@
+"""
+headless benchmarks for the tiling tree
+
+    python benchmarks/bench_layout.py
+    python benchmarks/bench_layout.py --sizes 10,100 --save base.json
+    python benchmarks/bench_layout.py --compare base.json
+
+every op is timed on synthetic workspaces (built with each tiling scheme)
+and run again under tracemalloc to see how much it allocates
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbwm.core import Workspace, NAV_DIRS, calc_display_nav  # noqa: E402
+from bbwm.geometry import Dims  # noqa: E402
+from bbwm.tiling import DefaultTilingScheme, HorizontalTilingScheme, ManualTilingScheme  # noqa: E402
+
+
+BASE_DIMS = Dims(0, 0, 7680, 4320)
+
+
+class FakeWin:
+    __slots__ = ('hwnd', 'part')
+
+    def __init__(self, hwnd):
+        self.hwnd = hwnd
+        self.part = None
+
+
+# -- building workspaces -- #
+
+def _tile_randomly(ws, n, rnd, tile_fun):
+    # tile into a random leaf every time so the tree doesn't become one long chain
+    hwnd = 0
+    while len(ws.leaf_index) < n:
+        hwnd += 1
+        ws.cur_part = rnd.choice(ws.find_leaf_parts())
+        tile_fun(ws, FakeWin(hwnd))
+    return ws
+
+
+def build_default(n, rnd):
+    ws = Workspace(BASE_DIMS, DefaultTilingScheme())
+    return _tile_randomly(ws, n, rnd, lambda ws, w: ws.tile(w))
+
+
+def build_horizontal(n, rnd):
+    ws = Workspace(BASE_DIMS, HorizontalTilingScheme())
+    ws.tile(FakeWin(0))
+    # one flat row, new windows go after the current one
+    hwnd = 0
+    while len(ws.leaf_index) < n:
+        hwnd += 1
+        ws.tile(FakeWin(hwnd))
+    return ws
+
+
+def build_manual(n, rnd):
+    ws = Workspace(BASE_DIMS, ManualTilingScheme())
+    return _tile_randomly(ws, n, rnd, lambda ws, w: ws._split(rnd.choice('hv'), new_win=w))
+
+
+BUILDERS = {
+    'default': build_default,
+    'horizontal': build_horizontal,
+    'manual': build_manual,
+}
+
+
+# -- ops -- #
+# each op gets a fresh rng & workspace and returns a function that does one op
+# (setup that shouldn't be timed happens in the op maker)
+
+def op_tile(ws, rnd):
+    hwnd = [10 ** 6]
+
+    def run():
+        hwnd[0] += 1
+        ws.tile(FakeWin(hwnd[0]))
+    return run
+
+
+def op_split(ws, rnd):
+    hwnd = [10 ** 6]
+
+    def run():
+        hwnd[0] += 1
+        ws.cur_part = rnd.choice(ws.find_leaf_parts())
+        ws._split(rnd.choice('hv'), new_win=FakeWin(hwnd[0]))
+    return run
+
+
+def op_untile(ws, rnd):
+    def run():
+        leaves = ws.find_leaf_parts()
+        if len(leaves) > 1:
+            ws.untile(rnd.choice(leaves))
+    return run
+
+
+def op_rotate(ws, rnd):
+    def run():
+        ws.cur_part = rnd.choice(ws.find_leaf_parts())
+        ws.rotate()
+    return run
+
+
+def op_resplit(ws, rnd):
+    splits = [p for p in ws.find_all_splits() if p.split.t is None]
+
+    def run():
+        if splits:
+            ws.resplit(rnd.choice(splits), rnd.choice([0.3, 0.4, 0.5, 0.6, 0.7]))
+    return run
+
+
+def op_find_move(ws, rnd):
+    # same layout over and over, so this is all nav cache hits
+    leaves = ws.find_leaf_parts()
+    ws.nav_graph()
+
+    def run():
+        ws.cur_part = rnd.choice(leaves)
+        ws.find_move(*rnd.choice(list(NAV_DIRS.values())))
+    return run
+
+
+def op_find_move_uncached(ws, rnd):
+    leaves = ws.find_leaf_parts()
+
+    def run():
+        d, n = rnd.choice(list(NAV_DIRS.values()))
+        ws._find_move(d, n, rnd.choice(leaves))
+    return run
+
+
+OPS = {
+    'tile': op_tile,
+    'split': op_split,
+    'untile': op_untile,
+    'rotate': op_rotate,
+    'resplit': op_resplit,
+    'find_move': op_find_move,
+    'find_move_uncached': op_find_move_uncached,
+}
+
+
+def display_grid(n):
+    cols = max(1, int(n ** 0.5))
+    return [Dims((i % cols) * 1920, (i // cols) * 1080, 1920, 1080) for i in range(n)]
+
+
+# -- measuring -- #
+
+def time_op(run, reps):
+    times = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def alloc_op(run, reps):
+    # bytes allocated & still alive (net) and peak, per op
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(reps):
+        run()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / reps, (peak - before) / reps
+
+
+def bench_tree(ws, op_name, reps, seed):
+    # ops mutate the workspace so each run gets its own copy
+    run_ws = copy.deepcopy(ws)
+    times = time_op(OPS[op_name](run_ws, random.Random(seed)), reps)
+
+    run_ws = copy.deepcopy(ws)
+    net, peak = alloc_op(OPS[op_name](run_ws, random.Random(seed)), reps)
+    return times, net, peak
+
+
+def bench_build(scheme, size, seed):
+    # returns the workspace too so the other ops can start from it
+    t0 = time.perf_counter()
+    ws = BUILDERS[scheme](size, random.Random(seed))
+    build_t = time.perf_counter() - t0
+
+    # allocations while building a smaller one, tracing is slow
+    alloc_size = min(size, 1000)
+    tracemalloc.start()
+    BUILDERS[scheme](alloc_size, random.Random(seed))
+    net, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ws, ([build_t / size], net / alloc_size, peak / alloc_size)
+
+
+def bench_display_nav(n_disps, reps):
+    disps = display_grid(n_disps)
+    times = time_op(lambda: calc_display_nav(disps), reps)
+    net, peak = alloc_op(lambda: calc_display_nav(disps), max(1, reps // 10))
+    return times, net, peak
+
+
+def summarize(times, net, peak):
+    return {
+        'median_us': statistics.median(times) * 1e6,
+        'max_us': max(times) * 1e6,
+        'net_bytes': net,
+        'peak_bytes': peak,
+    }
+
+
+def run_all(args):
+    results = {}
+    for scheme in args.schemes:
+        for size in args.sizes:
+            key = '{}/{}/build (per tile)'.format(scheme, size)
+            ws, res = bench_build(scheme, size, args.seed)
+            results[key] = summarize(*res)
+            report(key, results[key])
+            for op_name in args.ops:
+                key = '{}/{}/{}'.format(scheme, size, op_name)
+                results[key] = summarize(*bench_tree(ws, op_name, args.reps, args.seed))
+                report(key, results[key])
+    for n in args.displays:
+        key = 'displays/{}/calc_display_nav'.format(n)
+        results[key] = summarize(*bench_display_nav(n, args.reps))
+        report(key, results[key])
+    return results
+
+
+def report(key, res):
+    print('{:48s} {:12.2f} us  (max {:10.2f})  {:10.0f} B net  {:10.0f} B peak'.format(
+        key, res['median_us'], res['max_us'], res['net_bytes'], res['peak_bytes']))
+
+
+def compare(results, baseline, tolerance):
+    # regressions are medians that got slower than tolerance x the baseline
+    regressions = []
+    print('\n{:48s} {:>12s} {:>12s} {:>8s}'.format('vs baseline', 'base us', 'now us', 'ratio'))
+    for key, res in results.items():
+        if key not in baseline:
+            continue
+        base_t = baseline[key]['median_us']
+        ratio = res['median_us'] / base_t if base_t > 0 else 1.0
+        flag = ''
+        if ratio > tolerance:
+            flag = '  << slower'
+            regressions.append(key)
+        print('{:48s} {:12.2f} {:12.2f} {:8.2f}{}'.format(key, base_t, res['median_us'], ratio, flag))
+    return regressions
+
+
+def csv_list(conv):
+    def parse(s):
+        return [conv(x) for x in s.split(',') if x]
+    return parse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='bbwm layout benchmarks')
+    parser.add_argument('--sizes', type=csv_list(int), default=[10, 100, 1000, 5000])
+    parser.add_argument('--schemes', type=csv_list(str), default=list(BUILDERS))
+    parser.add_argument('--ops', type=csv_list(str), default=list(OPS))
+    parser.add_argument('--displays', type=csv_list(int), default=[1, 4, 16, 64])
+    parser.add_argument('--reps', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='write results to this json file')
+    parser.add_argument('--compare', help='compare against a saved json file')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='flag ops slower than this x the baseline')
+    args = parser.parse_args(argv)
+
+    results = run_all(args)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+memory footprint of the tiling tree
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --sizes 100,1000 --save base.json
+    python benchmarks/bench_memory.py --compare base.json
+
+workspaces are built under tracemalloc and what's left alive afterwards
+is divided by the number of partitions in them, the shallow size of
+single objects (partitions, windows, workspaces) is measured directly
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbwm import history  # noqa: E402
+from bbwm.backend import SimBackend  # noqa: E402
+from bbwm.core import Workspace  # noqa: E402
+from bbwm.win_api import WinWin  # noqa: E402
+
+from bench_layout import BASE_DIMS, BUILDERS  # noqa: E402
+
+
+def shallow_size(obj):
+    # the object plus whatever only it owns (its __dict__, its child list)
+    size = sys.getsizeof(obj)
+    d = getattr(obj, '__dict__', None)
+    if d is not None:
+        size += sys.getsizeof(d)
+    children = getattr(obj, 'children', None)
+    if isinstance(children, list):
+        size += sys.getsizeof(children)
+    return size
+
+
+def traced(fun):
+    # bytes still alive after fun(), and what it returned
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    res = fun()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, res
+
+
+def n_parts(ws):
+    return sum(1 for _ in ws.iter_pre_order())
+
+
+def bench_tree(scheme, size, seed):
+    net, ws = traced(lambda: BUILDERS[scheme](size, random.Random(seed)))
+    parts = n_parts(ws)
+    leaves = list(ws.iter_leaves())
+    inner = [p for p in ws.iter_pre_order() if p.children]
+    # windows are FakeWins here, leave them out
+    wins = sum(sys.getsizeof(p.window) for p in leaves if p.window is not None)
+
+    # one undo snapshot of the whole tree
+    snap_net, _ = traced(lambda: history.snapshot(ws))
+    return {
+        'parts': parts,
+        'bytes_per_part': (net - wins) / parts,
+        'leaf_bytes': sum(shallow_size(p) for p in leaves) / len(leaves),
+        'inner_bytes': sum(shallow_size(p) for p in inner) / len(inner) if inner else 0,
+        'snapshot_bytes_per_part': snap_net / parts,
+    }
+
+
+def bench_objects(n):
+    backend = SimBackend()
+    hwnds = [backend.create_window('w{}'.format(i)) for i in range(n)]
+    win_net, wins = traced(lambda: [WinWin(h, backend) for h in hwnds])
+    ws_net, wss = traced(lambda: [Workspace(BASE_DIMS) for _ in range(n)])
+    return {
+        'winwin_bytes': (win_net - sys.getsizeof(wins)) / n,
+        'winwin_shallow': shallow_size(wins[0]),
+        # includes its first (empty) partition & leaf index
+        'workspace_bytes': (ws_net - sys.getsizeof(wss)) / n,
+    }
+
+
+def report(key, res):
+    print('{:32s} {}'.format(key, '  '.join(
+        '{} {:9.1f}'.format(k, v) for k, v in sorted(res.items()))))
+
+
+def compare(results, baseline):
+    print('\n{:52s} {:>10s} {:>10s} {:>8s}'.format('vs baseline', 'base', 'now', 'ratio'))
+    for key, res in results.items():
+        for k, v in sorted(res.items()):
+            base = baseline.get(key, {}).get(k)
+            if not base or k == 'parts':
+                continue
+            print('{:52s} {:10.1f} {:10.1f} {:8.2f}'.format('{} {}'.format(key, k), base, v, v / base))
+
+
+def csv_list(conv):
+    def parse(s):
+        return [conv(x) for x in s.split(',') if x]
+    return parse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='bbwm memory benchmarks')
+    parser.add_argument('--sizes', type=csv_list(int), default=[10, 100, 1000])
+    parser.add_argument('--schemes', type=csv_list(str), default=list(BUILDERS))
+    parser.add_argument('--objects', type=int, default=1000,
+                        help='how many windows/workspaces to average over')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='write results to this json file')
+    parser.add_argument('--compare', help='compare against a saved json file')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scheme in args.schemes:
+        for size in args.sizes:
+            key = '{}/{}'.format(scheme, size)
+            results[key] = bench_tree(scheme, size, args.seed)
+            report(key, results[key])
+    results['objects'] = bench_objects(args.objects)
+    report('objects', results['objects'])
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
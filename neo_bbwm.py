@@ -2,26 +2,40 @@ import bbwm.drawing as bb_draw
 import bbwm.core as bb_core
 import bbwm.win_api as bb_api
 
+import bbwm.history as bb_history
+import bbwm.persist as bb_persist
 import bbwm.tiling as bb_tile
+import bbwm.trace as bb_trace
 
 import tkinter as tk
+import traceback
+
+from collections import Counter
 
 
 class BBWM:
-    def __init__(self, root):
+    def __init__(self, root, backend=None):
         # config
         self.c = bb_core.Config()
 
         # "backend"
-        self.win_methods = bb_api.WinMethods()
+        # no root means headless (drive it yourself w/ win_methods.pump_msgs)
+        self.win_methods = bb_api.WinMethods(backend=backend, queue_size=self.c.EVENT_QUEUE_SIZE,
+                                             info_ttl=self.c.WIN_INFO_TTL, rules=self.c.IGNORE_RULES)
         self.win_methods.msg_processor = self.process_msgs
+        self.win_methods.batch_processor = self.flush_msgs
+
+        self.tracer = bb_trace.Tracer(self.c.TRACE_LATENCY, self.c.TRACE_WINDOW)
+        self.win_methods.tracer = self.tracer
 
         self.num_displays = len(self.win_methods.monitors)
 
         self.display_ind = 0
         self.workspace_inds = [0] * self.num_displays
-        self._hiding_wins = 0
         self._just_closed = False
+        # work left over from the current batch of msgs
+        self._pending_resize = []
+        self._pending_refocus = False
 
         self.workspaces = []
         disp_dims = []
@@ -35,11 +49,22 @@ class BBWM:
         self.cur_adjust_part = None
         self.cur_adjust_stack = []
 
+        # live resizing, (part, ratio) waiting for the next frame
+        self._live_resplit = None
+        self._live_job = None
+        self._live_ws = None
+        self.resize_stats = Counter()
+
         # gui
-        self.gui = bb_draw.BBDraw(root, self.win_methods.monitor_bbox, self.c)
+        if root is None:
+            self.gui = bb_draw.NullDraw(self.c)
+        else:
+            self.gui = bb_draw.BBDraw(root, disp_dims, self.c)
+            self.gui.topmost_fun = self.win_methods.set_topmost
         self.gui.resplit_fun = self.resplit
-        self.gui.unfocus_fun = self.refocus
-        self.win_methods.set_topmost(root.winfo_id())
+        self.gui.live_resplit_fun = self.live_resplit
+        self.gui.unfocus_fun = self.menu_closed
+        self.gui.tracer = self.tracer
 
         self.hotkey_to_fun = {}
         self.setup_hotkeys()
@@ -66,11 +91,14 @@ class BBWM:
             d = adj
 
             def adjuster(*args):
-                cur_ratio = int(self.cur_adjust_part.split.r * self.c.N_KB_RATIOS)
+                part = self.cur_adjust_part
+                cur_ratio = int(round(self._live_ratio(part) * self.c.N_KB_RATIOS))
                 new_ratio = cur_ratio + d
                 new_ratio = max(1, min(self.c.N_KB_RATIOS - 1, new_ratio))
-                self.resplit(self.cur_adjust_part, new_ratio / self.c.N_KB_RATIOS, False)
-                self.gui.move_split(self.cur_adjust_part)
+                new_r = new_ratio / self.c.N_KB_RATIOS
+                # line moves now, windows on the next frame
+                self.live_resplit(part, new_r)
+                self.gui.move_split(part, r=new_r)
 
             return adjuster
 
@@ -100,8 +128,26 @@ class BBWM:
             ('<Tab>', self._split_adjust_go_next)
         ]
 
+        # workspace -> undo history
+        self.histories = {}
+
+        # listen before touching any windows, hiding them sends msgs we expect to get
+        self.running = True
+        if root is None:
+            self.win_methods.start_headless()
+        else:
+            self.win_methods.start_monitoring()
+
+        self._save_job = None
+        if self.c.LAYOUT_FILE:
+            self.restore_layout()
+
+        if self.c.ADOPT_ON_START:
+            self.adopt_windows()
+
         # rdy to go
-        self.win_methods.start_monitoring()
+        if root is not None:
+            self.poll_events()
 
     # workspaces
 
@@ -110,30 +156,42 @@ class BBWM:
         d_i = self.display_ind
         return self.workspaces[d_i][self.workspace_inds[d_i]]
 
+    @property
+    def shown_workspaces(self):
+        return [self.workspaces[d_i][ws_i] for d_i, ws_i in enumerate(self.workspace_inds)]
+
+    def workspace_of(self, part):
+        while part.parent is not None:
+            part = part.parent
+        for disp_wss in self.workspaces:
+            for ws in disp_wss:
+                if ws.children[0] is part or ws is part:
+                    return ws
+
     def change_workspace(self, new_ind):
         if new_ind >= self.c.NO_WORKSPACES:
             return
-        # hide cur workspace
-        if new_ind != self.workspace_inds[self.display_ind]:
-            all_parts = self.workspace.find_leaf_parts()
-            self._hiding_wins = len(all_parts)
-            for p in all_parts:
+        old_ws = self.workspace
+        self.workspace_inds[self.display_ind] = new_ind
+
+        # hide cur workspace & show new one in one go
+        # (resizing too, in case anything closed while it was hidden)
+        with self.win_methods.begin_moves() as moves:
+            if old_ws is not self.workspace:
+                for p in old_ws.find_leaf_parts():
+                    if p.window is not None:
+                        moves.hide(p.window)
+            for p in self.workspace.find_leaf_parts():
                 if p.window is not None:
-                    p.window.hide()
-                else:
-                    self._hiding_wins -= 1
+                    moves.show(p.window)
+            self._add_moves(moves)
 
-        # show new one
-        self.workspace_inds[self.display_ind] = new_ind
-        all_parts = self.workspace.find_leaf_parts()
-        for p in all_parts:
-            if p.window is not None:
-                p.window.unhide()
         # restore focus
         if self.workspace.cur_part.window is not None:
             self.workspace.cur_part.window.focus(True)
 
         self.draw_parts()
+        self.schedule_save()
 
     def change_display(self, dx, redraw=True):
         nav_dirs = self.display_nav[self.display_ind]
@@ -151,9 +209,119 @@ class BBWM:
         if redraw:
             self.draw_parts()
 
+    def change_displays(self):
+        # displays came, went or got resized
+        # whatever was on one that's gone ends up in the same workspace on the last one left
+        disp_dims = [d for _, d in self.win_methods.monitors]
+        n = len(disp_dims)
+        if not n:
+            return
+        old_wss, self.workspaces = self.workspaces, []
+        for d_i, display_dims in enumerate(disp_dims):
+            desktop = display_dims.get_ws_dims(self.c)
+            if d_i >= len(old_wss):
+                self.workspaces.append([bb_core.Workspace(desktop) for _ in range(self.c.NO_WORKSPACES)])
+                continue
+            for ws in old_wss[d_i]:
+                if ws.base_dims != desktop:
+                    ws.set_base_dims(desktop)
+            self.workspaces.append(old_wss[d_i])
+        for disp_wss in old_wss[n:]:
+            for ws_i, ws in enumerate(disp_wss):
+                for p in ws.find_leaf_parts():
+                    if p.window is not None:
+                        win, p.window, win.part = p.window, None, None
+                        self.workspaces[n - 1][ws_i].tile(win)
+                        if win.part is None:
+                            self.win_methods.forget_win(win.hwnd)
+
+        self.num_displays = n
+        self.workspace_inds = (self.workspace_inds + [0] * n)[:n]
+        self.display_ind = min(self.display_ind, n - 1)
+        self.display_nav = bb_core.calc_display_nav(disp_dims)
+        self.gui.change_monitors(disp_dims)
+
+        # windows probably got shuffled around too, so put everything back for sure
+        with self.win_methods.begin_moves() as moves:
+            for d_i, disp_wss in enumerate(self.workspaces):
+                for ws_i, ws in enumerate(disp_wss):
+                    shown = ws_i == self.workspace_inds[d_i]
+                    for p in ws.find_leaf_parts():
+                        if p.window is not None:
+                            if shown:
+                                moves.show(p.window)
+                            else:
+                                moves.hide(p.window)
+                    if shown:
+                        self._add_moves(moves, True, ws)
+        self.schedule_save()
+
+    # saving
+
+    def schedule_save(self):
+        # save a bit after things change, everything in between gets saved together
+        if not self.c.LAYOUT_FILE:
+            return
+        if self.gui.root is None:
+            self.save_layout()
+        elif self._save_job is None:
+            self._save_job = self.gui.root.after(self.c.SAVE_DELAY, self.save_layout)
+
+    def save_layout(self):
+        self._save_job = None
+        layout = bb_persist.dump_layout(self.workspaces, self.workspace_inds, self.display_ind)
+        try:
+            bb_persist.save(self.c.LAYOUT_FILE, layout)
+        except OSError as e:
+            print('couldn\'t save layout: {}'.format(e))
+
+    def restore_layout(self):
+        layout = bb_persist.load(self.c.LAYOUT_FILE)
+        if layout is None:
+            return
+
+        to_match = []
+        try:
+            for d_i, disp_wss in enumerate(layout['displays'][:self.num_displays]):
+                for ws_i, ws_data in enumerate(disp_wss[:self.c.NO_WORKSPACES]):
+                    to_match.extend(bb_persist.load_workspace(self.workspaces[d_i][ws_i], ws_data))
+                self.workspace_inds[d_i] = min(layout['workspace_inds'][d_i], self.c.NO_WORKSPACES - 1)
+            self.display_ind = min(layout['display_ind'], self.num_displays - 1)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            print('couldn\'t restore layout: {}'.format(e))
+            self.workspaces = [[bb_core.Workspace(ws.base_dims) for ws in disp_wss] for disp_wss in self.workspaces]
+            self.workspace_inds = [0] * self.num_displays
+            self.display_ind = 0
+            return
+
+        for win in bb_persist.WindowMatcher(self.win_methods).match(to_match):
+            if self.c.PRETTY_WINS:
+                win.undecorate()
+
+        # show/hide & move everything in one go
+        shown = self.shown_workspaces
+        with self.win_methods.begin_moves() as moves:
+            for disp_wss in self.workspaces:
+                for ws in disp_wss:
+                    is_shown = any(ws is s_ws for s_ws in shown)
+                    for p in ws.find_leaf_parts():
+                        if p.window is None:
+                            continue
+                        if is_shown:
+                            moves.show(p.window)
+                        else:
+                            moves.hide(p.window)
+                    if is_shown:
+                        self._add_moves(moves, workspace=ws)
+
     def debug_display(self):
         print(self.workspace)
         print(self.display_ind, self.workspace_inds)
+        print(dict(self.win_methods.move_stats))
+        print(self.win_methods.events.report())
+        print(self.tracer.dump())
+        print(self.gui.draw_stats())
+        print(dict(self.resize_stats))
 
     # movement
 
@@ -182,7 +350,8 @@ class BBWM:
         if d not in swap_dir_funs:
             return
 
-        swap_dir_funs[d]()
+        with self.recording():
+            swap_dir_funs[d]()
         self.resize_wins()
         self.refocus()
 
@@ -199,8 +368,14 @@ class BBWM:
 
     def tile(self):
         win = self.win_methods.get_focused_window()
+        if win is not None and win.part is not None:
+            # already tiled, put everything back where it belongs
+            self.resize_wins(force=True)
+            return
         if win is not None and win.part is None:
-            if not self.workspace.tile(win):
+            with self.recording():
+                tiled = self.workspace.tile(win)
+            if not tiled:
                 return
 
             if self.c.PRETTY_WINS:
@@ -217,13 +392,43 @@ class BBWM:
         if new_win is not None and self.c.PRETTY_WINS:
             new_win.undecorate()
 
-        self.workspace._split(d, new_win=new_win)
+        with self.recording():
+            self.workspace._split(d, new_win=new_win)
 
         self.resize_wins()
         self.refocus()
 
+    def adopt_windows(self):
+        # tile all open windows into their display's current workspace
+        # then move them all at once
+        wins = self.win_methods.scan_windows()
+        if not wins:
+            return
+        shown = self.shown_workspaces
+        for win in wins:
+            d_i = max(0, self.win_methods.monitor_from_hwnd(win.hwnd))
+            # not every scheme returns anything when it's placed a window
+            shown[d_i].tile(win)
+            if win.part is None:
+                self.win_methods.forget_win(win.hwnd)
+                continue
+            if self.c.PRETTY_WINS:
+                win.undecorate()
+
+        with self.win_methods.begin_moves() as moves:
+            for ws in shown:
+                self._add_moves(moves, workspace=ws)
+
+        # pick up where the user was
+        focused = self.win_methods.get_focused_window(True)
+        if focused is not None and focused.part is not None:
+            self.display_ind = max(0, self.win_methods.monitor_from_hwnd(focused.hwnd))
+            self.workspace.cur_part = focused.part
+        self.refocus()
+
     def untile(self):
-        untiled_part = self.workspace.untile()
+        with self.recording():
+            untiled_part = self.workspace.untile()
         if untiled_part is None:
             return
 
@@ -232,10 +437,55 @@ class BBWM:
             if self.c.PRETTY_WINS:
                 win.redecorate()
             # delet the window
-            if win.hwnd in self.win_methods.hwnd_to_win:
-                del self.win_methods.hwnd_to_win[win.hwnd]
+            self.win_methods.forget_win(win.hwnd)
             if win.part is not None:
                 win.part.window = None
+                win.part = None
+
+        self.resize_wins()
+        self.refocus()
+
+    # history
+
+    def history(self, ws=None):
+        if ws is None:
+            ws = self.workspace
+        if ws not in self.histories:
+            self.histories[ws] = bb_history.History(self.c.UNDO_DEPTH)
+        return self.histories[ws]
+
+    def recording(self):
+        # whatever happens to the current workspace in here can be undone
+        return self.history().recording(self.workspace)
+
+    def undo(self):
+        self._step_history(self.history().undo)
+
+    def redo(self):
+        self._step_history(self.history().redo)
+
+    def _step_history(self, step):
+        self._end_live_resize()
+        ws = self.workspace
+        before = [p.window for p in ws.find_leaf_parts() if p.window is not None]
+        restored = step(ws)
+        if restored is None:
+            return
+
+        for win in restored:
+            if self.win_methods.revive_win(win):
+                if self.c.PRETTY_WINS:
+                    win.undecorate()
+            else:
+                # closed (or replaced) since
+                win.part.window = None
+                win.part = None
+        # ones that aren't tiled anymore
+        for win in before:
+            if win.part is None:
+                if self.c.PRETTY_WINS:
+                    win.redecorate()
+                self.win_methods.forget_win(win.hwnd)
 
         self.resize_wins()
         self.refocus()
@@ -243,25 +493,100 @@ class BBWM:
     # editing partitions
 
     def rotate(self):
-        self.workspace.rotate()
+        with self.recording():
+            self.workspace.rotate()
         self.resize_wins()
         self.refocus()
 
     def resplit(self, part, new_r, redraw=True):
-        self.workspace.resplit(part, new_r)
+        # the final say, so whatever a live resize had waiting is dropped
+        self._live_resplit = None
+        with self.recording():
+            self.workspace.resplit(part, new_r)
+        self._end_live_resize()
         self.resize_wins()
         # gui
         if redraw:
             self.draw_parts()
 
-    def resize_wins(self):
-        all_parts = self.workspace.find_leaf_parts()
-        for p in all_parts:
+    # live resizing (dragging a split or holding an arrow key)
+    # only the latest ratio is applied, at most once a frame
+
+    def live_resplit(self, part, new_r):
+        if new_r is None:
+            return
+        ws = self.workspace_of(part)
+        if ws is None:
+            return
+        if self._live_ws is None:
+            self._live_ws = ws
+            self.history(ws).begin(ws)
+        self.resize_stats['inputs'] += 1
+        if self._live_resplit is not None:
+            self.resize_stats['coalesced'] += 1
+        self._live_resplit = (part, new_r)
+
+        if self.gui.root is None:
+            self._flush_live_resplit()
+        elif self._live_job is None:
+            self._live_job = self.gui.root.after(self.c.FRAME_DUR, self._flush_live_resplit)
+
+    def _live_ratio(self, part):
+        # where part's split is headed
+        if self._live_resplit is not None and self._live_resplit[0] is part:
+            return self._live_resplit[1]
+        return part.split.r
+
+    def _flush_live_resplit(self):
+        self._live_job = None
+        if self._live_resplit is None:
+            return
+        part, new_r = self._live_resplit
+        self._live_resplit = None
+        ws = self.workspace_of(part)
+        if ws is None:
+            return
+        ws.resplit(part, new_r)
+        self.resize_stats['applied'] += 1
+        # hidden workspaces get resized once they're shown again
+        if any(ws is s_ws for s_ws in self.shown_workspaces):
+            self.resize_wins(workspace=ws)
+
+    def _end_live_resize(self):
+        self._flush_live_resplit()
+        if self._live_ws is not None:
+            self.history(self._live_ws).end(self._live_ws)
+            self._live_ws = None
+
+    def menu_closed(self):
+        self._end_live_resize()
+        self.refocus()
+
+    def _add_moves(self, moves, force=False, workspace=None):
+        if workspace is None:
+            workspace = self.workspace
+        for p in workspace.find_leaf_parts():
             if p.window is not None:
                 win_dim = p.dims.get_win_dims(self.c)
-                p.window.set_dims(win_dim)
+                moves.add(p.window, win_dim, force)
+
+    def resize_wins(self, force=False, workspace=None):
+        # only windows whose spot changed actually get moved (unless forced)
+        self.tracer.mark('layout')
+        with self.win_methods.begin_moves() as moves:
+            self._add_moves(moves, force, workspace)
+        self.tracer.mark('apply')
+        self.schedule_save()
 
     def change_scheme(self, new_ts):
+        with self.recording():
+            self._change_scheme(new_ts)
+
+        self.resize_wins()
+        # gui
+        self.draw_parts()  # needs delay or proper cancel from menu fadeout
+
+    def _change_scheme(self, new_ts):
         cp = self.workspace.cur_part
         if cp.parent is not None:
             cp = cp.parent
@@ -284,10 +609,6 @@ class BBWM:
             p.assoc_ts = new_ts
             p.resize_from_parent()
 
-        self.resize_wins()
-        # gui
-        self.draw_parts()  # needs delay or proper cancel from menu fadeout
-
     def to_default_scheme(self):
         d_ts = bb_tile.DefaultTilingScheme()
         self.change_scheme(d_ts)
@@ -307,9 +628,11 @@ class BBWM:
         return picker_fun
 
     def _draw_workspaces(self):
-        self.gui.clear_screen()
+        self.gui.begin_frame()
         win_list = []
-        x, y = self.gui._calc_mon_offset()
+        # every window gets a row under the minimap
+        n_rows = sum(1 for p in self.workspace.find_leaf_parts() if p.window is not None)
+        x, y = self.gui._calc_mon_offset(n_rows)
         cur_i = -1
 
         disp_hints = {
@@ -340,9 +663,10 @@ class BBWM:
                         c += 1
                     else:
                         txt = ''
-                    self.gui.draw_win(p.dims.get_win_dims(self.c), x, y, txt, p == cur_part)
+                    self.gui.draw_win(p, p.dims.get_win_dims(self.c), x, y, txt, p == cur_part)
 
         self.gui.draw_menu_list(win_list, self.display_changers, x, y, cur_i)
+        self.gui.end_frame()
 
     def draw_workspaces(self):
         self.gui.fofi_draw('workspaces', self._draw_workspaces)
@@ -352,22 +676,24 @@ class BBWM:
         cur_part = self.workspace.cur_part
 
         def draw_later():
-            self.gui.clear_screen()
+            self.gui.begin_frame()
             for p in all_parts:
-                self.gui.draw_part(p.dims.get_win_dims(self.c), cur_part == p)
+                self.gui.draw_part(p, p.dims.get_win_dims(self.c), cur_part == p)
+            self.gui.end_frame()
 
-        self.gui.fofifo_draw('parts', draw_later)
+        self.gui.fofifo_draw('parts', draw_later, self.display_ind)
 
     def _redraw_splits(self):
-        self.gui.clear_screen()
+        self.gui.begin_frame()
         for s_s in self.cur_adjust_part.split_siblings:
             if s_s == self.cur_adjust_part:
                 continue
-            self.gui.draw_part(s_s.dims, False)
+            self.gui.draw_part(s_s, s_s.dims, False)
             self.gui.draw_split(s_s, False, False)
 
-        self.gui.draw_part(self.cur_adjust_part.dims, True, True)
+        self.gui.draw_part(self.cur_adjust_part, self.cur_adjust_part.dims, True)
         self.gui.draw_split(self.cur_adjust_part, True)
+        self.gui.end_frame()
 
     def draw_splits(self):
         self.cur_adjust_part = self.workspace.cur_part.parent
@@ -376,8 +702,8 @@ class BBWM:
 
         self.cur_adjust_stack = []
 
+        self.gui.fofi_draw('splits', self._redraw_splits, self.display_ind)
         self.gui.split_menu(self.split_adjust_binds)
-        self.gui.fofi_draw('splits', self._redraw_splits)
 
     def _split_adjust_go_up(self, *args):
         if self.cur_adjust_part.parent is None:
@@ -419,8 +745,9 @@ class BBWM:
         ]
 
         def draw_later():
-            self.gui.clear_screen()
+            self.gui.begin_frame()
             self.gui.draw_menu(tags_to_funs)
+            self.gui.end_frame()
 
         self.gui.fofi_draw('menu', draw_later)
 
@@ -428,6 +755,7 @@ class BBWM:
 
     def _add_hotkey(self, key_combo, func, args=[], trigger_on_release=False, suppress=True):
         new_hk_id = self.win_methods.add_hotkey(key_combo)
+        self.tracer.name_action(new_hk_id, ' '.join([func.__name__] + [str(a) for a in args]))
         rrr = args
 
         def execute():
@@ -470,6 +798,9 @@ class BBWM:
             ('win+delete', self.change_display, ['l'], True),
             ('win+pgdown', self.change_display, ['r'], True),
 
+            ('ctrl+f7', self.undo),
+            ('ctrl+f8', self.redo),
+
             ('win+shift+q', self.quit_helper),
             ('win+shift+r', self.debug_display),
         ]
@@ -477,36 +808,65 @@ class BBWM:
         for bind in all_binds:
             self._add_hotkey(*bind)
 
+    def poll_events(self):
+        # msgs get handled on the tk thread, the msg thread only queues them
+        # one bad msg shouldn't stop us from handling the rest
+        try:
+            self.win_methods.handle_events()
+        except Exception:
+            traceback.print_exc()
+        finally:
+            if self.running:
+                self.gui.root.after(self.c.EVENT_POLL, self.poll_events)
+
     def process_msgs(self, msg):
+        self.tracer.mark('dispatch')
         if msg[0] == 'focus_win':
             w = self.win_methods._get_or_add_win(msg[1], False)
-            if w is not None and w.part is not None:
+            if w is not None and w.part is not None and 0 <= msg[2] < self.num_displays:
                 self.display_ind = msg[2]
                 self.workspace.cur_part = w.part
             if self._just_closed:
-                self.refocus()
+                self._pending_refocus = True
             self._just_closed = False
         elif msg[0] == 'close_win':
-            # apparently hiding windows sends the same msg as closing them..
-            if self._hiding_wins > 0:
-                self._hiding_wins -= 1
-                return
             w = self.win_methods._get_or_add_win(msg[1], False)
             if w is not None and w.part is not None:
-                self.workspace.untile(w.part)
+                ws = self.workspace_of(w.part)
+                ws.untile(w.part)
 
                 win = w.part.window
                 if win is not None:
                     if win.part is not None:
                         win.part.window = None
 
-                del self.win_methods.hwnd_to_win[msg[1]]
-                self.resize_wins()
+                self.win_methods.forget_win(msg[1])
+                if ws not in self._pending_resize:
+                    self._pending_resize.append(ws)
                 self._just_closed = True
+        elif msg[0] == 'display_change':
+            self.flush_msgs()
+            self.change_displays()
         elif msg[0] in self.hotkey_to_fun:
+            # hotkeys see everything that happened before them
+            self.flush_msgs()
             self.hotkey_to_fun[msg[0]]()
 
+    def flush_msgs(self):
+        # one layout/move/draw for everything the last batch of msgs changed
+        # hidden workspaces get resized once they're shown again
+        pending, self._pending_resize = self._pending_resize, []
+        shown = self.shown_workspaces
+        for ws in pending:
+            if any(ws is s_ws for s_ws in shown):
+                self.resize_wins(workspace=ws)
+        if self._pending_refocus:
+            self._pending_refocus = False
+            self.refocus()
+
     def quit_helper(self):
+        if self.c.LAYOUT_FILE:
+            self.save_layout()
         for _, w in self.win_methods.hwnd_to_win.items():
             try:
                 if w.part is not None:
@@ -516,10 +876,10 @@ class BBWM:
             except:
                 pass
 
-        if self.win_methods.spy is not None:
-            self.win_methods.unbind_hotkeys()
-            self.win_methods.spy.destroy()
-        self.gui.root.destroy()
+        self.running = False
+        self.win_methods.stop_monitoring()
+        if self.gui.root is not None:
+            self.gui.root.destroy()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# so tests can import bbwm & neo_bbwm without installing anything
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
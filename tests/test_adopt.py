@@ -0,0 +1,18 @@
+from bbwm.backend import SimBackend
+from bbwm.core import Workspace
+from bbwm.tiling import HorizontalTilingScheme
+from neo_bbwm import BBWM
+
+
+def test_adopt_into_empty_horizontal_workspace():
+    b = SimBackend()
+    wm = BBWM(None, b)
+    ws = wm.workspace
+    wm.workspaces[0][0] = Workspace(ws.base_dims, HorizontalTilingScheme())
+    hwnds = [b.create_window('w{}'.format(i)) for i in range(3)]
+    wm.adopt_windows()
+    # the first one fills the empty partition without a new split being returned
+    for hwnd in hwnds:
+        win = wm.win_methods.hwnd_to_win[hwnd]
+        assert win.part is not None
+        assert b.windows[hwnd].rect == win.part.dims.get_win_dims(wm.c)
@@ -0,0 +1,98 @@
+from collections import Counter
+
+from bbwm.backend import SimBackend
+from bbwm.batch import MoveBatch
+from bbwm.geometry import Dims
+from bbwm.win_api import WinWin
+from neo_bbwm import BBWM
+
+
+def wins(b, n):
+    return [WinWin(b.create_window('w{}'.format(i)), b) for i in range(n)]
+
+
+def defer_calls(b):
+    return {k: b.calls[k] for k in ['begin_defer', 'defer', 'defer_visibility', 'end_defer', 'move']}
+
+
+def test_one_deferred_batch_for_all_moves():
+    b = SimBackend()
+    ws = wins(b, 5)
+    with MoveBatch(b) as moves:
+        for i, w in enumerate(ws):
+            moves.add(w, Dims(i * 100, 0, 100, 100))
+    assert defer_calls(b) == {'begin_defer': 1, 'defer': 5, 'defer_visibility': 0, 'end_defer': 1, 'move': 0}
+    for i, w in enumerate(ws):
+        assert b.windows[w.hwnd].rect == Dims(i * 100, 0, 100, 100)
+
+
+def test_unchanged_windows_skipped():
+    b = SimBackend()
+    ws = wins(b, 3)
+    with MoveBatch(b) as moves:
+        for w in ws:
+            moves.add(w, Dims(0, 0, 100, 100))
+    b.calls.clear()
+    moves = MoveBatch(b)
+    for w in ws:
+        moves.add(w, Dims(0, 0, 100, 100))
+    moves.add(ws[0], Dims(0, 0, 200, 200))
+    assert moves.commit() == 1
+    assert b.calls['defer'] == 1 and moves.stats['skipped'] == 3
+    # unless forced
+    b.calls.clear()
+    with MoveBatch(b) as moves:
+        for w in ws:
+            moves.add(w, w.applied_dims, force=True)
+    assert b.calls['defer'] == 3 and b.calls['begin_defer'] == 1
+
+
+def test_nothing_to_do_no_calls():
+    b = SimBackend()
+    with MoveBatch(b):
+        pass
+    assert sum(defer_calls(b).values()) == 0
+
+
+def test_hides_shows_and_moves_together():
+    b = SimBackend()
+    ws = wins(b, 4)
+    for w in ws[2:]:
+        b.hide(w.hwnd)
+    b.calls.clear()
+    hidden = Counter()
+    with MoveBatch(b, hidden=hidden) as moves:
+        moves.hide(ws[0])
+        moves.show(ws[2])
+        moves.show(ws[3])
+        # moving it shows it anyway
+        moves.add(ws[3], Dims(0, 0, 50, 50))
+    assert defer_calls(b) == {'begin_defer': 1, 'defer': 1, 'defer_visibility': 2, 'end_defer': 1, 'move': 0}
+    assert not b.windows[ws[0].hwnd].visible and hidden == {ws[0].hwnd: 1}
+    assert b.windows[ws[2].hwnd].visible and b.windows[ws[3].hwnd].visible
+
+
+def test_bad_window_falls_back_to_one_by_one():
+    b = SimBackend()
+    ws = wins(b, 3)
+    b.close_window(ws[1].hwnd)
+    b.calls.clear()
+    with MoveBatch(b) as moves:
+        for w in ws:
+            moves.add(w, Dims(0, 0, 100, 100))
+    assert b.calls['end_defer'] == 0 and b.calls['move'] == 3
+    assert b.windows[ws[0].hwnd].rect == b.windows[ws[2].hwnd].rect == Dims(0, 0, 100, 100)
+
+
+def test_swap_only_moves_the_two_windows():
+    b = SimBackend()
+    wm = BBWM(None, b)
+    for i in range(4):
+        b.create_window('w{}'.format(i))
+        b.press('alt+f5')
+        wm.win_methods.pump_msgs()
+    b.calls.clear()
+    b.press('win+f11')
+    wm.win_methods.pump_msgs()
+    assert b.calls['begin_defer'] == b.calls['end_defer'] == 1
+    assert b.calls['defer'] == 2
@@ -0,0 +1,60 @@
+from bbwm.backend import SimBackend
+from bbwm.geometry import Dims
+from neo_bbwm import BBWM
+
+
+LEFT, RIGHT = Dims(0, 0, 1920, 1080), Dims(1920, 0, 1920, 1080)
+
+
+def setup(monitors):
+    b = SimBackend()
+    b.change_monitors(monitors)
+    wm = BBWM(None, b)
+    wm.win_methods.pump_msgs()
+    return b, wm
+
+
+def tile_on(b, wm, rect, d_i=0):
+    wm.display_ind = d_i
+    hwnd = b.create_window('w', rect=rect)
+    b.press('alt+f5')
+    wm.win_methods.pump_msgs()
+    return hwnd
+
+
+def test_display_added():
+    b, wm = setup([LEFT])
+    tile_on(b, wm, Dims(10, 10, 300, 300))
+    b.change_monitors([LEFT, RIGHT])
+    wm.win_methods.pump_msgs()
+    assert len(wm.workspaces) == len(wm.workspace_inds) == wm.num_displays == 2
+    # focusing a window on the new display doesn't blow up
+    hwnd = tile_on(b, wm, Dims(2000, 10, 300, 300), 1)
+    b.focus_window(hwnd)
+    wm.win_methods.pump_msgs()
+    assert wm.display_ind == 1
+    assert wm.workspace.cur_part.window.hwnd == hwnd
+
+
+def test_display_removed():
+    b, wm = setup([LEFT, RIGHT])
+    hwnd = tile_on(b, wm, Dims(2000, 10, 300, 300), 1)
+    b.change_monitors([LEFT])
+    wm.win_methods.pump_msgs()
+    assert wm.display_ind == 0 and wm.num_displays == 1
+    # its window moved over to the one that's left
+    win = wm.win_methods.hwnd_to_win[hwnd]
+    assert wm.workspace_of(win.part) is wm.workspace
+    assert b.windows[hwnd].rect == win.part.dims.get_win_dims(wm.c)
+    b.focus_window(hwnd)
+    wm.win_methods.pump_msgs()
+
+
+def test_display_resized():
+    b, wm = setup([LEFT])
+    hwnd = tile_on(b, wm, Dims(10, 10, 300, 300))
+    b.change_monitors([Dims(0, 0, 1280, 720)])
+    wm.win_methods.pump_msgs()
+    win = wm.win_methods.hwnd_to_win[hwnd]
+    assert wm.workspace.base_dims == Dims(0, 0, 1280, 720).get_ws_dims(wm.c)
+    assert b.windows[hwnd].rect == win.part.dims.get_win_dims(wm.c)
@@ -0,0 +1,56 @@
+from bbwm.backend import SimBackend
+from bbwm.events import coalesce
+from neo_bbwm import BBWM
+
+
+def run(msgs, tracked=()):
+    return [m for m, _ in coalesce([(m, i) for i, m in enumerate(msgs)], tracked)]
+
+
+def test_tracked_window_closed_for_good():
+    assert run([('close_win', 1), ('new_win', 1), ('close_win', 1)], {1}) == [('close_win', 1)]
+
+
+def test_reused_hwnd_closes_then_opens():
+    assert run([('close_win', 1), ('new_win', 1)], {1}) == [('close_win', 1), ('new_win', 1)]
+
+
+def test_open_at_the_end_stays_open():
+    assert run([('new_win', 1), ('close_win', 1), ('new_win', 1)]) == [('new_win', 1)]
+
+
+def test_came_and_went():
+    msgs = [('new_win', 1), ('focus_win', 1), ('title_change', 1), ('close_win', 1), ('focus_win', 2)]
+    assert run(msgs) == [('focus_win', 2)]
+
+
+def test_last_focus_and_repeats():
+    msgs = [('focus_win', 1), ('title_change', 1), ('focus_win', 2), ('title_change', 1)]
+    assert run(msgs, {1, 2}) == [('focus_win', 2), ('title_change', 1)]
+
+
+def test_nothing_moves_past_hotkeys():
+    msgs = [('new_win', 1), (5, 0), ('close_win', 1)]
+    assert run(msgs) == msgs
+    # created before the hotkey, so closing it after still counts
+    msgs = [('new_win', 1), (5, 0), ('new_win', 1), ('close_win', 1)]
+    assert run(msgs) == [('new_win', 1), (5, 0), ('close_win', 1)]
+
+
+def test_tiled_window_closed_in_a_busy_batch():
+    b = SimBackend()
+    wm = BBWM(None, b)
+    hwnds = []
+    for i in range(2):
+        hwnds.append(b.create_window('w{}'.format(i)))
+        b.press('alt+f5')
+        wm.win_methods.pump_msgs()
+
+    hwnd = hwnds[0]
+    b.close_window(hwnd)
+    # windows reuses the hwnd straight away & that one's gone just as fast
+    b._msgs.put(('new_win', hwnd))
+    b._msgs.put(('close_win', hwnd))
+    wm.win_methods.pump_msgs()
+    assert hwnd not in wm.win_methods.hwnd_to_win
+    assert all(p.window is not None for p in wm.workspace.find_leaf_parts())
@@ -0,0 +1,55 @@
+from bbwm.backend import SimBackend
+from neo_bbwm import BBWM
+
+
+def pump_one_by_one(wm, b):
+    # every msg in a batch of its own, like when they trickle in
+    msg = b.next_msg(False)
+    while msg is not None:
+        wm.win_methods.events.put(msg)
+        wm.win_methods.handle_events()
+        msg = b.next_msg(False)
+
+
+def tiled(n):
+    b = SimBackend()
+    wm = BBWM(None, b)
+    hwnds = []
+    for i in range(n):
+        hwnds.append(b.create_window('w{}'.format(i)))
+        b.press('alt+f5')
+        wm.win_methods.pump_msgs()
+    return b, wm, hwnds
+
+
+def test_hiding_twice_isnt_closing():
+    b, wm, hwnds = tiled(2)
+
+    # hidden, shown & hidden again before any of the msgs come in
+    wm.change_workspace(1)
+    wm.change_workspace(0)
+    wm.change_workspace(1)
+    pump_one_by_one(wm, b)
+    wm.change_workspace(0)
+    pump_one_by_one(wm, b)
+    for hwnd in hwnds:
+        assert wm.win_methods.hwnd_to_win[hwnd].part is not None
+
+    # & actually closing it still counts
+    b.close_window(hwnds[0])
+    wm.win_methods.pump_msgs()
+    assert hwnds[0] not in wm.win_methods.hwnd_to_win
+    assert wm.win_methods.hwnd_to_win[hwnds[1]].part is not None
+
+
+def test_hides_in_one_batch_all_count():
+    b, wm, hwnds = tiled(2)
+    # both msgs come in together (& would be coalesced into one)
+    wm.change_workspace(1)
+    wm.change_workspace(0)
+    wm.change_workspace(1)
+    wm.change_workspace(0)
+    wm.win_methods.pump_msgs()
+    b.close_window(hwnds[0])
+    wm.win_methods.pump_msgs()
+    assert hwnds[0] not in wm.win_methods.hwnd_to_win
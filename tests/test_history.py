@@ -0,0 +1,62 @@
+import random
+
+from bbwm import history
+from bbwm.core import Workspace, NAV_DIRS
+from bbwm.geometry import Dims
+from bbwm.tiling import ManualTilingScheme
+
+
+class FakeWin:
+    def __init__(self, hwnd):
+        self.hwnd = hwnd
+        self.part = None
+
+
+def check_nav(ws):
+    # cached moves have to be the same as working them out from scratch
+    for p in ws.find_leaf_parts():
+        ws.cur_part = p
+        for d, n in NAV_DIRS.values():
+            assert ws.find_move(d, n) is ws._find_move(d, n, p)
+
+
+def test_nav_after_undo():
+    ws = Workspace(Dims(0, 0, 1920, 1080), ManualTilingScheme())
+    hist = history.History()
+    with hist.recording(ws):
+        ws._split('h', new_win=FakeWin(1))
+    check_nav(ws)
+    with hist.recording(ws):
+        ws._split('v', new_win=FakeWin(2))
+    check_nav(ws)
+    hist.undo(ws)
+    check_nav(ws)
+    hist.redo(ws)
+    check_nav(ws)
+
+
+def test_nav_after_random_undo_redo():
+    # short runs, so the rebuilt leaf index's version is likely to line up
+    # with one the nav cache was filled at
+    for seed in range(3000):
+        rnd = random.Random(seed)
+        ws = Workspace(Dims(0, 0, 1920, 1080), ManualTilingScheme())
+        hist = history.History()
+        hwnd = 0
+        for _ in range(rnd.randint(2, 8)):
+            op = rnd.choice(['split', 'split', 'untile', 'undo', 'redo', 'nav'])
+            ws.cur_part = rnd.choice(ws.find_leaf_parts())
+            if op == 'split':
+                hwnd += 1
+                with hist.recording(ws):
+                    ws._split(rnd.choice('hv'), new_win=FakeWin(hwnd))
+            elif op == 'untile' and len(ws.leaf_index) > 1:
+                with hist.recording(ws):
+                    ws.untile()
+            elif op == 'undo':
+                hist.undo(ws)
+            elif op == 'redo':
+                hist.redo(ws)
+            elif op == 'nav':
+                ws.find_move(*rnd.choice(list(NAV_DIRS.values())))
+        check_nav(ws)
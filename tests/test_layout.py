@@ -0,0 +1,86 @@
+import random
+
+from bbwm import history
+from bbwm.core import Workspace, NAV_DIRS, iter_pre_order, iter_leaves
+from bbwm.geometry import Dims
+from bbwm.tiling import DefaultTilingScheme, HorizontalTilingScheme, ManualTilingScheme
+
+
+class FakeWin:
+    def __init__(self, hwnd):
+        self.hwnd = hwnd
+        self.part = None
+
+
+def full_dims(ws):
+    # every partition's dims worked out again from the root down
+    root = ws.children[0]
+    tor = {root: ws.base_dims}
+    for p in iter_pre_order(root):
+        for c in p.children:
+            s, d = p.split, tor[p]
+            if s.t is None:
+                tor[c] = d.resize(s.d, s.r, c.index)
+            else:
+                tor[c] = d.resize_n(s.d, len(p.children), c.index)
+    return tor
+
+
+def walk_neighbors(ws, d, part):
+    # the old way, up through the ancestors & then all the leaves under splits that way
+    i = 1 if d == 'v' else 0
+    tor = []
+    for p in ws._bottom_up_traverse(part):
+        if p.split is not None and p.split.d == d:
+            tor.extend(leaf for leaf in iter_leaves(p) if leaf.dims.adjacency_check(part.dims, i))
+    tor.append(part)
+    return set(tor)
+
+
+def check(ws):
+    for p, d in full_dims(ws).items():
+        assert p.dims == d
+    leaves = list(iter_leaves(ws.children[0]))
+    assert ws.find_leaf_parts() == leaves
+    for p in leaves:
+        for d in 'hv':
+            assert set(ws.find_neighbors(d, p)) == walk_neighbors(ws, d, p)
+        ws.cur_part = p
+        for d, n in NAV_DIRS.values():
+            assert ws.find_move(d, n) is ws._find_move(d, n, p)
+
+
+def test_incremental_layout_matches_from_scratch():
+    for seed in range(300):
+        rnd = random.Random(seed)
+        scheme = rnd.choice([DefaultTilingScheme, HorizontalTilingScheme, ManualTilingScheme])
+        ws = Workspace(Dims(0, 0, 1920, 1080), scheme())
+        hist = history.History()
+        hwnd = 0
+        for _ in range(rnd.randint(1, 25)):
+            ws.cur_part = rnd.choice(ws.find_leaf_parts())
+            op = rnd.choice(['tile', 'tile', 'split', 'untile', 'rotate', 'resplit', 'undo', 'redo', 'nav'])
+            if op == 'undo':
+                hist.undo(ws)
+            elif op == 'redo':
+                hist.redo(ws)
+            elif op == 'nav':
+                ws.find_move(*rnd.choice(list(NAV_DIRS.values())))
+            else:
+                with hist.recording(ws):
+                    if op == 'tile':
+                        hwnd += 1
+                        ws.tile(FakeWin(hwnd))
+                    elif op == 'split':
+                        hwnd += 1
+                        ws._split(rnd.choice('hvn'), new_win=FakeWin(hwnd))
+                    elif op == 'untile':
+                        ws.untile()
+                    elif op == 'rotate':
+                        ws.rotate()
+                    else:
+                        splits = [p for p in iter_pre_order(ws.children[0])
+                                  if p.split is not None and p.split.t is None]
+                        if splits:
+                            ws.resplit(rnd.choice(splits), rnd.uniform(0.1, 0.9))
+            check(ws)
@@ -0,0 +1,56 @@
+from bbwm.backend import SimBackend
+from bbwm.geometry import Dims
+from neo_bbwm import BBWM
+
+
+def tiled(n):
+    b = SimBackend()
+    wm = BBWM(None, b)
+    hwnds = []
+    for i in range(n):
+        hwnds.append(b.create_window('w{}'.format(i)))
+        b.press('alt+f5')
+        wm.win_methods.pump_msgs()
+    return b, wm, hwnds
+
+
+def tile_another(b, wm, hwnd):
+    # a layout change that leaves hwnd's spot alone
+    before = slot(wm, hwnd)
+    b.create_window('another')
+    b.press('alt+f5')
+    wm.win_methods.pump_msgs()
+    assert slot(wm, hwnd) == before
+
+
+def slot(wm, hwnd):
+    return wm.win_methods.hwnd_to_win[hwnd].part.dims.get_win_dims(wm.c)
+
+
+def test_dragged_window_goes_back_on_next_layout():
+    b, wm, hwnds = tiled(2)
+    b.move_window(hwnds[0], Dims(100, 100, 300, 300))
+    wm.win_methods.pump_msgs()
+    tile_another(b, wm, hwnds[0])
+    assert b.windows[hwnds[0]].rect == slot(wm, hwnds[0])
+
+
+def test_moved_without_a_msg_noticed_on_focus():
+    b, wm, hwnds = tiled(2)
+    # like maximizing, no msg about it
+    b.windows[hwnds[0]].rect = Dims(0, 0, 1920, 1080)
+    b.focus_window(hwnds[0])
+    wm.win_methods.pump_msgs()
+    # so the new one goes next to the other
+    b.focus_window(hwnds[1])
+    wm.win_methods.pump_msgs()
+    tile_another(b, wm, hwnds[0])
+    assert b.windows[hwnds[0]].rect == slot(wm, hwnds[0])
+
+
+def test_tiling_a_tiled_window_puts_it_back():
+    b, wm, hwnds = tiled(2)
+    b.windows[hwnds[1]].rect = Dims(0, 0, 1920, 1080)
+    b.press('alt+f5')
+    wm.win_methods.pump_msgs()
+    assert b.windows[hwnds[1]].rect == slot(wm, hwnds[1])
@@ -0,0 +1,32 @@
+from bbwm import persist
+from bbwm.backend import SimBackend
+from neo_bbwm import BBWM
+
+
+def find_win_node(node):
+    if 'w' in node:
+        return node
+    for child in node.get('c', []):
+        found = find_win_node(child)
+        if found is not None:
+            return found
+
+
+def test_bad_window_entry_means_fresh_layout(tmp_path):
+    b = SimBackend()
+    wm = BBWM(None, b)
+    for i in range(2):
+        b.create_window('w{}'.format(i))
+        b.press('alt+f5')
+        wm.win_methods.pump_msgs()
+    layout = persist.dump_layout(wm.workspaces, wm.workspace_inds, wm.display_ind)
+
+    for bad in [5, ['x'], [None, 'cls', 'title'], [1, ['cls'], 'title']]:
+        find_win_node(layout['displays'][0][0]['root'])['w'] = bad
+        path = str(tmp_path / 'layout.json')
+        persist.save(path, layout)
+
+        wm2 = BBWM(None, b)
+        wm2.c.LAYOUT_FILE = path
+        wm2.restore_layout()
+        assert len(wm2.workspace.find_leaf_parts()) == 1
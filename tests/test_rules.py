@@ -0,0 +1,82 @@
+import random
+import re
+
+from bbwm.backend import SimBackend
+from bbwm.rules import Rule, WindowRules
+from neo_bbwm import BBWM
+
+
+def test_ignored_window_verdict_reused_until_closed():
+    b = SimBackend()
+    wm = BBWM(None, b)
+    rules = wm.win_methods.rules
+    hwnd = b.create_window('Cortana')
+    wm.win_methods.pump_msgs()
+    assert hwnd not in wm.win_methods.hwnd_to_win
+    assert rules._cache[hwnd] is True
+
+    # shown again, no need to ask it anything
+    before = b.calls['get_title']
+    b._msgs.put(('new_win', hwnd))
+    wm.win_methods.pump_msgs()
+    assert b.calls['get_title'] == before
+
+    b.set_title(hwnd, 'not cortana')
+    wm.win_methods.pump_msgs()
+    assert hwnd not in rules._cache
+    wm.win_methods._get_or_add_win(hwnd)
+    assert rules._cache[hwnd] is False
+
+    # the hwnd could be a different window by the next time it comes up
+    b.close_window(hwnd)
+    wm.win_methods.pump_msgs()
+    assert hwnd not in rules._cache
+
+
+class FakeWin:
+    def __init__(self, hwnd, title, cls, process, style):
+        self.hwnd = hwnd
+        self.title = title
+        self.class_name = cls
+        self.process_name = process
+        self.style = style
+
+
+def naive_ignores(rules, win):
+    # every rule on its own, every field of it has to match (& empty ones never do)
+    for r in rules:
+        if r == Rule():
+            continue
+        if r.title is not None and not re.fullmatch(r.title, win.title):
+            continue
+        if r.cls is not None and not re.fullmatch(r.cls, win.class_name):
+            continue
+        if r.process is not None and r.process.lower() != win.process_name.lower():
+            continue
+        if r.style and not win.style[0] & r.style:
+            continue
+        if r.exstyle and not win.style[1] & r.exstyle:
+            continue
+        return True
+    return False
+
+
+def test_merged_rules_match_rule_by_rule():
+    titles = ['a', 'ab', 'b', 'Cortana', '', 'x y']
+    classes = ['A', 'B', 'AB']
+    procs = ['a.exe', 'B.exe', 'c.EXE']
+    for seed in range(300):
+        rnd = random.Random(seed)
+        rules = []
+        for _ in range(rnd.randint(1, 5)):
+            rules.append(Rule(
+                rnd.choice([None, 'a', 'a.*', 'b|x y', '.*']),
+                rnd.choice([None, 'A', 'A.*']),
+                rnd.choice([None, 'a.exe', 'b.exe']),
+                rnd.choice([0, 0, 1, 2]),
+                rnd.choice([0, 0, 4])))
+        wr = WindowRules(rules)
+        for i in range(20):
+            win = FakeWin(i, rnd.choice(titles), rnd.choice(classes), rnd.choice(procs),
+                          (rnd.randint(0, 3), rnd.randint(0, 7)))
+            assert wr.ignores(win) == naive_ignores(rules, win), (rules, vars(win))
@@ -0,0 +1,36 @@
+from bbwm.backend import SimBackend
+from bbwm.trace import Tracer
+from neo_bbwm import BBWM
+
+
+def test_batch_flush_is_traced():
+    b = SimBackend()
+    wm = BBWM(None, b)
+    wm.tracer.enabled = True
+    hwnds = []
+    for i in range(2):
+        hwnds.append(b.create_window('w{}'.format(i)))
+        b.press('alt+f5')
+        wm.win_methods.pump_msgs()
+    b.close_window(hwnds[0])
+    wm.win_methods.pump_msgs()
+    # the close is only laid out/moved once the batch gets flushed
+    pcts = wm.tracer.percentiles('close_win')
+    assert 'layout' in pcts and 'apply' in pcts
+
+
+def test_superseded_draw_is_still_timed():
+    tracer = Tracer(enabled=True)
+    tracer.begin('a')
+    tracer.draw_markers()
+    tracer.end_dispatch()
+    # b's draw replaces a's before a's ever ran
+    tracer.begin('b')
+    start, end = tracer.draw_markers()
+    tracer.end_dispatch()
+    tracer.end_batch()
+    start()
+    end()
+    assert tracer.superseded == 1
+    for action in 'ab':
+        assert tracer.percentiles(action)['draw_end'][0] == 1
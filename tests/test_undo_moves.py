@@ -0,0 +1,32 @@
+from bbwm.backend import SimBackend
+from bbwm.geometry import Dims
+from neo_bbwm import BBWM
+
+
+def test_undo_untile_moves_window_back():
+    b = SimBackend()
+    wm = BBWM(None, b)
+
+    def press(k):
+        b.press(k)
+        wm.win_methods.pump_msgs()
+
+    hwnds = []
+    for i in range(2):
+        hwnds.append(b.create_window('w{}'.format(i)))
+        press('alt+f5')
+
+    part = wm.workspace.cur_part
+    hwnd = part.window.hwnd
+    tiled_rect = part.dims.get_win_dims(wm.c)
+    assert b.windows[hwnd].rect == tiled_rect
+
+    press('alt+f6')
+    assert part.window is None
+    # user drags it somewhere else while it's not ours
+    b.move_window(hwnd, Dims(100, 100, 300, 300))
+
+    press('ctrl+f7')
+    win = wm.win_methods.hwnd_to_win[hwnd]
+    assert win.part is not None
+    assert b.windows[hwnd].rect == win.part.dims.get_win_dims(wm.c)